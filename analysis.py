@@ -0,0 +1,80 @@
+import pandas as pd
+
+from cache import CACHE_DIR
+from instrumentation import stage
+from indicators import compute_indicators, compute_window_indicators, indicator_frame
+from loader import DATA_DIR, discover_files, load_stock_files
+
+# Columns of the signal table written for downstream consumers
+SIGNAL_COLUMNS = [
+    'Date', 'Stock', 'Close', 'MA_10', 'STD_10', 'Upper_Band', 'Lower_Band', 'Signal', 'Std_Deviations',
+]
+
+
+def load_data(data_dir=DATA_DIR, on_missing=None, timer=None, roll=None, cache_dir=CACHE_DIR):
+    """Front-month rows of every stock CSV in ``data_dir`` as one frame
+
+    ``roll`` switches to back-adjusted continuous series (see
+    ``loader.read_stock_file``). Per-stage timings are recorded on ``timer``
+    when one is given.
+    """
+    with stage(timer, 'discover_files'):
+        files = discover_files(data_dir)
+    dfs = load_stock_files(files, cache_dir=cache_dir, on_missing=on_missing, timer=timer, roll=roll)
+    if not dfs:
+        return pd.DataFrame()
+    with stage(timer, 'concat'):
+        combined_df = pd.concat(dfs, ignore_index=True)
+        return combined_df.astype({'Symbol': 'category', 'Stock': 'category'})
+
+
+def load_and_analyze_data(data_dir=DATA_DIR, window_size=10, num_std=1, on_missing=None, timer=None, roll=None,
+                          dtype='float64'):
+    """Load every stock in ``data_dir`` and add indicators and signals
+
+    ``dtype='float32'`` stores the indicator columns in single precision.
+    """
+    combined_df = load_data(data_dir, on_missing=on_missing, timer=timer, roll=roll)
+    if combined_df.empty:
+        return combined_df
+    with stage(timer, 'indicators'):
+        return compute_indicators(combined_df, window_size=window_size, num_std=num_std, dtype=dtype)
+
+
+def load_and_analyze_windows(data_dir=DATA_DIR, windows=(10,), num_std=1, on_missing=None, timer=None, roll=None,
+                             dtype='float64', cache_dir=CACHE_DIR):
+    """Like ``load_and_analyze_data`` for several windows: ``{window: frame}``"""
+    combined_df = load_data(data_dir, on_missing=on_missing, timer=timer, roll=roll, cache_dir=cache_dir)
+    if combined_df.empty:
+        return {window: combined_df for window in windows}
+    with stage(timer, 'indicators'):
+        return compute_window_indicators(combined_df, windows, num_std=num_std, dtype=dtype)
+
+
+def analyze_store(store, window_size=10, num_std=1, symbols=None, start=None, end=None, timer=None,
+                  dtype='float64'):
+    """Indicators and signals for a slice of a ``store.BhavcopyStore``
+
+    Filtering, front-month selection and the rolling mean and std run in
+    SQL, so only rows of ``symbols`` (all by default) between ``start`` and
+    ``end`` are materialized. The frame matches ``load_and_analyze_data``
+    with Stock taken from the Symbol column.
+    """
+    with stage(timer, 'store_query'):
+        rows = store.rolling(window_size, symbols=symbols, start=start, end=end)
+    rows['Stock'] = rows['Symbol']
+    rows = rows.astype({'Symbol': 'category', 'Stock': 'category'})
+    ma = rows.pop('ma').to_numpy()
+    std = rows.pop('std').to_numpy()
+    with stage(timer, 'indicators'):
+        return indicator_frame(rows, ma, std, num_std, dtype)
+
+
+def select_dates(data, start=None, end=None):
+    """Rows with ``start <= Date <= end``; either bound may be None"""
+    mask = pd.Series(True, index=data.index)
+    if start is not None:
+        mask &= data['Date'] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= data['Date'] <= pd.Timestamp(end)
+    return data[mask]
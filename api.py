@@ -0,0 +1,316 @@
+"""HTTP API serving the signal table to other services
+
+Endpoints (all GET, HEAD also accepted):
+
+    /signals?date=YYYY-MM-DD      signals for one date, latest date by default
+    /history/<SYMBOL>?start=&end=  one stock's analyzed rows, optionally by date
+    /symbols                       stocks currently loaded
+    /health                        data version and row count
+
+Responses are JSON unless ``format=arrow`` is given or the ``Accept`` header
+asks for ``application/vnd.apache.arrow.stream``. Every response carries an
+ETag derived from the data version, so clients can revalidate with
+``If-None-Match`` and get a 304. Computed responses are kept in an in-memory
+LRU that is cleared whenever the CSV files change.
+
+    python api.py --port 8080
+"""
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import sys
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import pandas as pd
+
+from analysis import SIGNAL_COLUMNS, load_and_analyze_data, select_dates
+from indicators import with_signal_labels
+from loader import DATA_DIR, data_version
+from signal_index import DateSignalIndex
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - Arrow responses are unavailable
+    pa = None
+
+JSON_TYPE = 'application/json'
+ARROW_TYPE = 'application/vnd.apache.arrow.stream'
+MAX_HEADER_BYTES = 64 * 1024
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message=None):
+        super().__init__(message or status.phrase)
+        self.status = status
+        self.message = message or status.phrase
+
+
+class ResponseCache:
+    """Least-recently-used map of request keys to encoded responses"""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def encode_frame(df, content_type):
+    """Serialize ``df`` as JSON records or an Arrow IPC stream"""
+    if content_type == ARROW_TYPE:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue()
+    return df.to_json(orient='records', date_format='iso').encode('utf-8')
+
+
+class SignalService:
+    """Analyzed data plus the request routing and response cache
+
+    The CSV files are checked for changes at most every ``refresh_interval``
+    seconds; a change reloads the data in a worker thread and clears the
+    response cache. Requests arriving during a reload are answered from the
+    data already loaded, and so are all requests when a reload fails (say a
+    CSV file is half written); it is retried after the next interval.
+    """
+
+    def __init__(self, data_dir=DATA_DIR, window_size=10, cache_size=1024, refresh_interval=5.0):
+        self.data_dir = data_dir
+        self.window_size = window_size
+        self.refresh_interval = refresh_interval
+        self.cache = ResponseCache(cache_size)
+        self.version = None
+        self.data = pd.DataFrame()
+        self._index = None
+        self._stocks = {}
+        self._checked_at = float('-inf')
+        self._lock = asyncio.Lock()
+
+    def _load(self, version):
+        data = load_and_analyze_data(self.data_dir, window_size=self.window_size)
+        stocks = {stock: rows for stock, rows in data.groupby('Stock', sort=False, observed=True)} if not data.empty else {}
+        index = DateSignalIndex(data) if not data.empty else None
+        return version, data, index, stocks
+
+    async def refresh(self, force=False):
+        """Reload the data if the CSV files changed since the last check"""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.refresh_interval:
+            return
+        if not force and self._lock.locked() and self.version is not None:
+            return  # Another request is reloading; keep serving the current data
+        async with self._lock:
+            if not force and time.monotonic() - self._checked_at < self.refresh_interval:
+                return
+            loop = asyncio.get_running_loop()
+            try:
+                version = await loop.run_in_executor(None, data_version, self.data_dir)
+                if version != self.version:
+                    loaded = await loop.run_in_executor(None, self._load, version)
+                    self.version, self.data, self._index, self._stocks = loaded
+                    self.cache.clear()
+            except Exception as error:
+                print(f"Reloading {self.data_dir} failed, serving version {self.version}: {error!r}",
+                      file=sys.stderr)
+            self._checked_at = time.monotonic()
+
+    def _content_type(self, query, headers):
+        fmt = query.get('format')
+        if fmt is None:
+            fmt = 'arrow' if ARROW_TYPE in headers.get('accept', '') else 'json'
+        if fmt == 'json':
+            return JSON_TYPE
+        if fmt == 'arrow':
+            if pa is None:
+                raise HTTPError(HTTPStatus.NOT_ACCEPTABLE, "Arrow responses need pyarrow")
+            return ARROW_TYPE
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"Unknown format {fmt!r}")
+
+    def _signals(self, query):
+        if self._index is None:
+            return pd.DataFrame(columns=SIGNAL_COLUMNS)
+        date = query.get('date')
+        try:
+            date = pd.Timestamp(date) if date else self._index.dates[-1]
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid date {query['date']!r}") from None
+        if date not in self._index:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No data for {date.date()}")
+        return with_signal_labels(self._index.rows(date)[SIGNAL_COLUMNS].sort_values('Stock'))
+
+    def _history(self, symbol, query):
+        rows = self._stocks.get(symbol)
+        if rows is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Unknown symbol {symbol!r}")
+        try:
+            rows = select_dates(rows, query.get('start'), query.get('end'))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid start or end date") from None
+        return with_signal_labels(rows[SIGNAL_COLUMNS])
+
+    def _route(self, path, query, content_type):
+        if path == '/signals':
+            return encode_frame(self._signals(query), content_type)
+        if path.startswith('/history/'):
+            return encode_frame(self._history(unquote(path[len('/history/'):]), query), content_type)
+        if path == '/symbols':
+            return encode_frame(pd.DataFrame({'Stock': sorted(self._stocks)}), content_type)
+        if path == '/health':
+            body = {'version': self.version, 'rows': len(self.data), 'cached_responses': len(self.cache)}
+            return json.dumps(body).encode('utf-8')
+        raise HTTPError(HTTPStatus.NOT_FOUND)
+
+    async def respond(self, method, target, headers):
+        """(status, headers, body) for one request"""
+        if method not in ('GET', 'HEAD'):
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+        await self.refresh()
+
+        url = urlsplit(target)
+        query = dict(parse_qsl(url.query))
+        content_type = self._content_type(query, headers)
+        if url.path == '/health':
+            content_type = JSON_TYPE
+            query = {}
+
+        key = (url.path, tuple(sorted(query.items())), content_type)
+        entry = None if url.path == '/health' else self.cache.get(key)
+        if entry is None:
+            body = self._route(url.path, query, content_type)
+            digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:12]
+            entry = (f'"{self.version}-{digest}"', body)
+            if url.path != '/health':
+                self.cache.put(key, entry)
+
+        etag, body = entry
+        response_headers = {'Content-Type': content_type, 'ETag': etag, 'Cache-Control': 'no-cache'}
+        if etag in (value.strip() for value in headers.get('if-none-match', '').split(',')):
+            return HTTPStatus.NOT_MODIFIED, response_headers, b''
+        return HTTPStatus.OK, response_headers, body
+
+
+def _write_response(writer, status, headers, body, keep_alive, head_only=False):
+    lines = [f'HTTP/1.1 {status.value} {status.phrase}']
+    headers = dict(headers)
+    headers['Content-Length'] = str(len(body))
+    headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+    lines.extend(f'{name}: {value}' for name, value in headers.items())
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+    if body and not head_only and status != HTTPStatus.NOT_MODIFIED:
+        writer.write(body)
+
+
+async def handle_connection(service, reader, writer):
+    """Serve requests on one connection until the client closes it"""
+    try:
+        while True:
+            try:
+                raw = await reader.readuntil(b'\r\n\r\n')
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            except asyncio.LimitOverrunError:
+                _write_response(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, {}, b'', False)
+                break
+
+            request_line, *header_lines = raw.decode('latin-1').split('\r\n')
+            try:
+                method, target, protocol = request_line.split(' ')
+            except ValueError:
+                _write_response(writer, HTTPStatus.BAD_REQUEST, {}, b'', False)
+                break
+            headers = {}
+            for line in header_lines:
+                if ':' in line:
+                    name, value = line.split(':', 1)
+                    headers[name.strip().lower()] = value.strip()
+
+            connection = headers.get('connection', '').lower()
+            keep_alive = connection != 'close' if protocol == 'HTTP/1.1' else connection == 'keep-alive'
+
+            # Discard any request body; the API only reads the URL
+            try:
+                length = int(headers.get('content-length', 0) or 0)
+                if length < 0:
+                    raise ValueError(length)
+            except ValueError:
+                _write_response(writer, HTTPStatus.BAD_REQUEST, {}, b'', False)
+                break
+            if length:
+                await reader.readexactly(length)
+
+            try:
+                status, response_headers, body = await service.respond(method, target, headers)
+            except HTTPError as error:
+                status = error.status
+                response_headers = {'Content-Type': JSON_TYPE}
+                body = json.dumps({'error': error.message}).encode('utf-8')
+            except Exception as error:
+                print(f"Error answering {method} {target}: {error!r}", file=sys.stderr)
+                status = HTTPStatus.INTERNAL_SERVER_ERROR
+                response_headers = {'Content-Type': JSON_TYPE}
+                body = json.dumps({'error': status.phrase}).encode('utf-8')
+
+            _write_response(writer, status, response_headers, body, keep_alive, head_only=method == 'HEAD')
+            await writer.drain()
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+
+async def serve(service, host='127.0.0.1', port=8080):
+    await service.refresh(force=True)
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(service, reader, writer),
+        host, port, limit=MAX_HEADER_BYTES,
+    )
+    addresses = ', '.join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Serving signals on {addresses}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve trading signals over HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--data-dir', default=DATA_DIR, help="directory holding the stock CSV files")
+    parser.add_argument('--window', type=int, default=10, help="moving average window (default: 10)")
+    parser.add_argument('--cache-size', type=int, default=1024, help="responses kept in memory (default: 1024)")
+    parser.add_argument('--refresh-interval', type=float, default=5.0,
+                        help="seconds between checks for changed CSV files (default: 5)")
+    args = parser.parse_args(argv)
+
+    service = SignalService(args.data_dir, args.window, args.cache_size, args.refresh_interval)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
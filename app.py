@@ -1,8 +1,17 @@
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
+import tempfile
 from datetime import datetime
 
+from analysis import load_and_analyze_windows
+from backtest import run_backtest, summarize_backtest
+from charts import build_stock_figure, stock_frames
+from incremental import IncrementalDataset
+from indicators import BUY, HOLD, SELL
+from instrumentation import StageTimer
+from loader import DATA_DIR, data_version
+from signal_index import DateSignalIndex
+
 # Set page config
 st.set_page_config(
     page_title="Stock Trading Signals",
@@ -12,123 +21,178 @@ st.set_page_config(
 
 # Title
 st.title("Stock Trading Signals Dashboard")
-st.markdown("**10-Day Moving Average with ±1 Standard Deviation Strategy**")
-
-@st.cache_data
-def load_and_analyze_data():
-    """Load and analyze stock data"""
-    files = [
-        ('Eternal', 'Eternal.csv'),
-        ('ADANIGREEN', 'ADANIGREEN.csv'),
-        ('PAYTM', 'PAYTM.csv'),
-        ('NTPC', 'NTPC.csv'),
-        ('DLF', 'DLF.csv')
-    ]
-    
-    dfs = []
-    for stock_name, file in files:
-        try:
-            df = pd.read_csv(file)
-            df.columns = df.columns.str.strip()
-            df = df.sort_values(['Date', 'Expiry']).groupby('Date').first().reset_index()
-            df['Stock'] = stock_name
-            dfs.append(df)
-        except FileNotFoundError:
-            st.error(f"File {file} not found!")
-            continue
-    
-    if not dfs:
-        return pd.DataFrame()
-    
-    combined_df = pd.concat(dfs, ignore_index=True)
-    combined_df['Date'] = pd.to_datetime(combined_df['Date'], format='%d-%b-%Y')
-    combined_df = combined_df.sort_values(['Stock', 'Date'])
-    
-    # Analysis with 10-day moving average and ±1 std dev
-    window_size = 10
-    result_df = pd.DataFrame()
-    
-    for stock in combined_df['Stock'].unique():
-        stock_data = combined_df[combined_df['Stock'] == stock].copy()
-        stock_data = stock_data.sort_values('Date')
-        
-        stock_data['MA_10'] = stock_data['Close'].rolling(window=window_size, min_periods=1).mean()
-        stock_data['STD_10'] = stock_data['Close'].rolling(window=window_size, min_periods=1).std()
-        stock_data['Upper_Band'] = stock_data['MA_10'] + (1 * stock_data['STD_10'])
-        stock_data['Lower_Band'] = stock_data['MA_10'] - (1 * stock_data['STD_10'])
-        
-        # Generate signals
-        stock_data['Signal'] = 'Hold'
-        stock_data.loc[stock_data['Close'] < stock_data['Lower_Band'], 'Signal'] = 'Buy'
-        stock_data.loc[stock_data['Close'] > stock_data['Upper_Band'], 'Signal'] = 'Sell'
-        
-        # Calculate standard deviations
-        stock_data['Std_Deviations'] = (stock_data['Close'] - stock_data['MA_10']) / stock_data['STD_10']
-        
-        result_df = pd.concat([result_df, stock_data])
+
+# Chart time periods and how many calendar days each covers
+TIME_PERIODS = {"All Data": None, "Last 7 Days": 7, "Last 14 Days": 14}
+
+# Moving average windows the dashboard can switch between
+WINDOW_SIZES = (5, 10, 20, 30, 50)
+
+# Per-date price series: front-month contract or a back-adjusted continuous series
+PRICE_SERIES = {
+    "Front month": None,
+    "Continuous, roll 3 days before expiry": {'rule': 'expiry', 'days': 3, 'adjust': 'ratio'},
+    "Continuous, roll on open interest": {'rule': 'open_interest', 'adjust': 'ratio'},
+}
+
+@st.cache_resource(max_entries=2)
+def load_and_analyze_data(data_dir=DATA_DIR, version=None, series="Front month", windows=WINDOW_SIZES,
+                          dtype='float64', _timer=None):
+    """Load and analyze stock data for every window size
+
+    Returns ``{window: frame}``. ``version`` only keys the cache, so edited
+    CSV files are picked up. Stages are recorded on ``_timer`` when the data
+    is actually loaded rather than served from the cache.
+    """
+    return load_and_analyze_windows(
+        data_dir,
+        windows,
+        on_missing=lambda file: st.error(f"File {file} not found!"),
+        timer=_timer,
+        roll=PRICE_SERIES[series],
+        dtype=dtype
+    )
+
+@st.cache_resource
+def get_incremental_dataset(data_dir=DATA_DIR, window_size=10, dtype='float64'):
+    """Shared dataset that picks up rows appended to the CSVs"""
+    return IncrementalDataset(data_dir, window_size=window_size, dtype=dtype)
+
+def render_signal_column(show, signals, empty_message, limit):
+    """Render one signal column as a single element, strongest signals first"""
+    if signals.empty:
+        st.info(empty_message)
+        return
     
-    result_df = result_df.reset_index(drop=True)
-    return result_df
+    top = signals.sort_values('Std_Deviations', key=abs, ascending=False, na_position='last').head(limit)
+    lines = [
+        f"**{stock}**: Rs.{close:.2f} · MA: Rs.{ma:.2f} | {std_devs:.2f}σ"
+        for stock, close, ma, std_devs in zip(top['Stock'], top['Close'], top['MA_10'], top['Std_Deviations'])
+    ]
+    show("  \n".join(lines))
+    if len(signals) > limit:
+        st.caption(f"Showing {limit} of {len(signals)} stocks by |σ|")
+
+@st.cache_resource(max_entries=8)
+def get_period_frames(version, time_period, _data):
+    """Per-stock chart data for a time period, split once per data version"""
+    return stock_frames(_data, TIME_PERIODS[time_period])
+
+@st.cache_resource(max_entries=1024)
+def get_stock_figure(version, time_period, stock, high_volume, window_size, _stock_data):
+    """Chart for one stock, reused until the data or chart options change"""
+    return build_stock_figure(stock, _stock_data, high_volume=high_volume, window_size=window_size)
+
+@st.cache_resource(max_entries=2)
+def get_backtest_summary(version, _data):
+    """Per-stock backtest metrics, computed once per data version"""
+    return summarize_backtest(run_backtest(_data))
+
+@st.cache_resource(max_entries=2)
+def get_signal_index(version, _data):
+    """Date lookup for the signal panel, built once per data version"""
+    return DateSignalIndex(_data)
+
+st.sidebar.header("Controls")
+
+window_size = st.sidebar.selectbox(
+    "Moving average window (days):",
+    WINDOW_SIZES,
+    index=WINDOW_SIZES.index(10)
+)
+
+st.markdown(f"**{window_size}-Day Moving Average with ±1 Standard Deviation Strategy**")
+
+incremental = st.sidebar.checkbox(
+    "Incremental refresh",
+    value=False,
+    help="Analyze only rows appended to the CSV files since the last run"
+)
+
+price_series = st.sidebar.selectbox(
+    "Price series:",
+    list(PRICE_SERIES),
+    disabled=incremental,
+    help="Continuous series stitch contracts at each roll and back-adjust earlier prices, "
+         "removing the price jumps at monthly expiries. Incremental refresh uses the front month."
+)
+
+low_precision = st.sidebar.checkbox(
+    "Float32 indicators",
+    value=False,
+    help="Store moving averages, bands and σ in single precision to halve their memory. "
+         "Values change by less than 1e-7 relative; signals are unchanged."
+)
+dtype = 'float32' if low_precision else 'float64'
+
+diagnostics = st.sidebar.checkbox(
+    "Diagnostics",
+    value=False,
+    help="Record time and memory for each loading and rendering stage"
+)
+timer = StageTimer(enabled=diagnostics)
 
 # Load data
 with st.spinner("Loading data..."):
-    data = load_and_analyze_data()
+    if incremental:
+        dataset = get_incremental_dataset(DATA_DIR, window_size, dtype)
+        with timer.stage("incremental_refresh"):
+            data = dataset.refresh()
+        version = f"incremental-{dataset.version}-w{window_size}-{dtype}"
+    else:
+        files_version = data_version(DATA_DIR)
+        data = load_and_analyze_data(DATA_DIR, files_version, price_series, dtype=dtype, _timer=timer)[window_size]
+        version = f"{files_version}-{list(PRICE_SERIES).index(price_series)}-w{window_size}-{dtype}"
 
 if data.empty:
     st.error("No data available. Please check your CSV files.")
+    timer.close()
     st.stop()
 
-st.sidebar.header("Controls")
+with timer.stage("signal_index"):
+    signal_index = get_signal_index(version, data)
 
-available_dates = sorted(data['Date'].dt.date.unique())
+available_dates = [date.date() for date in signal_index.dates]
 selected_date = st.sidebar.selectbox(
     "Select Date:",
     available_dates,
     index=len(available_dates)-1  
 )
 
+max_signals = st.sidebar.number_input(
+    "Max stocks per signal column:",
+    min_value=1,
+    value=25,
+    step=5,
+    help="Stocks beyond this are hidden, keeping the ones furthest from the MA"
+)
+
 selected_datetime = pd.to_datetime(selected_date)
 
-date_data = data[data['Date'] == selected_datetime]
+date_data = signal_index.rows(selected_datetime)
 
 # Main content
 st.header(f"Trading Signals for {selected_date}")
 
-if not date_data.empty:
-    col1, col2, col3 = st.columns(3)
+with timer.stage("render_signals"):
+    if not date_data.empty:
+        col1, col2, col3 = st.columns(3)
     
-    buy_signals = date_data[date_data['Signal'] == 'Buy']
-    sell_signals = date_data[date_data['Signal'] == 'Sell']
-    hold_signals = date_data[date_data['Signal'] == 'Hold']
+        buy_signals, sell_signals, hold_signals = signal_index.signals(selected_datetime)
     
-    with col1:
-        st.subheader("BUY Signals")
-        if not buy_signals.empty:
-            for _, row in buy_signals.iterrows():
-                st.success(f"**{row['Stock']}**: Rs.{row['Close']:.2f}")
-                st.caption(f"MA: Rs.{row['MA_10']:.2f} | {row['Std_Deviations']:.2f}σ")
-        else:
-            st.info("No buy signals")
+        with col1:
+            st.subheader("BUY Signals")
+            render_signal_column(st.success, buy_signals, "No buy signals", max_signals)
     
-    with col2:
-        st.subheader("SELL Signals")
-        if not sell_signals.empty:
-            for _, row in sell_signals.iterrows():
-                st.error(f"**{row['Stock']}**: Rs.{row['Close']:.2f}")
-                st.caption(f"MA: Rs.{row['MA_10']:.2f} | {row['Std_Deviations']:.2f}σ")
-        else:
-            st.info("No sell signals")
+        with col2:
+            st.subheader("SELL Signals")
+            render_signal_column(st.error, sell_signals, "No sell signals", max_signals)
     
-    with col3:
-        st.subheader("HOLD Signals")
-        if not hold_signals.empty:
-            for _, row in hold_signals.iterrows():
-                st.warning(f"**{row['Stock']}**: Rs.{row['Close']:.2f}")
-                st.caption(f"MA: Rs.{row['MA_10']:.2f} | {row['Std_Deviations']:.2f}σ")
-        else:
-            st.info("No hold signals")
-else:
-    st.warning(f"No data available for {selected_date}")
+        with col3:
+            st.subheader("HOLD Signals")
+            render_signal_column(st.warning, hold_signals, "No hold signals", max_signals)
+    else:
+        st.warning(f"No data available for {selected_date}")
 
 # Stock trends section
 st.header("Stock Price Trends")
@@ -144,126 +208,111 @@ if selected_stocks:
     # Time period selection
     time_period = st.selectbox(
         "Select time period:",
-        ["All Data", "Last 7 Days", "Last 14 Days"],
+        list(TIME_PERIODS),
         index=0
     )
     
-    # Filter data based on time period
-    if time_period == "Last 7 Days":
-        cutoff_date = data['Date'].max() - pd.Timedelta(days=7)
-        chart_data = data[data['Date'] >= cutoff_date]
-    elif time_period == "Last 14 Days":
-        cutoff_date = data['Date'].max() - pd.Timedelta(days=14)
-        chart_data = data[data['Date'] >= cutoff_date]
-    else:
-        chart_data = data
+    high_volume = st.checkbox(
+        "High-volume chart mode",
+        value=False,
+        help="Draw with WebGL and downsample long series; Buy/Sell markers are kept exactly"
+    )
+    
+    period_frames = get_period_frames(version, time_period, data)
     
     # Create charts for each selected stock
     for stock in selected_stocks:
-        stock_data = chart_data[chart_data['Stock'] == stock].copy()
+        stock_data = period_frames.get(stock)
         
-        if stock_data.empty:
+        if stock_data is None or stock_data.empty:
             continue
         
-        # Create plotly chart
-        fig = go.Figure()
-        
-        # Add price line
-        fig.add_trace(go.Scatter(
-            x=stock_data['Date'],
-            y=stock_data['Close'],
-            mode='lines+markers',
-            name='Close Price',
-            line=dict(color='blue', width=2)
-        ))
-        
-        # Add moving average
-        fig.add_trace(go.Scatter(
-            x=stock_data['Date'],
-            y=stock_data['MA_10'],
-            mode='lines',
-            name='10-Day MA',
-            line=dict(color='orange', dash='dash')
-        ))
-        
-        # Add Bollinger Bands
-        fig.add_trace(go.Scatter(
-            x=stock_data['Date'],
-            y=stock_data['Upper_Band'],
-            mode='lines',
-            name='Upper Band (+1σ)',
-            line=dict(color='red', dash='dot'),
-            showlegend=False
-        ))
-        
-        fig.add_trace(go.Scatter(
-            x=stock_data['Date'],
-            y=stock_data['Lower_Band'],
-            mode='lines',
-            name='Lower Band (-1σ)',
-            line=dict(color='green', dash='dot'),
-            fill='tonexty',
-            fillcolor='rgba(128,128,128,0.1)',
-            showlegend=True
-        ))
-        
-        # Add buy/sell signals
-        buy_points = stock_data[stock_data['Signal'] == 'Buy']
-        sell_points = stock_data[stock_data['Signal'] == 'Sell']
-        
-        if not buy_points.empty:
-            fig.add_trace(go.Scatter(
-                x=buy_points['Date'],
-                y=buy_points['Close'],
-                mode='markers',
-                name='Buy Signal',
-                marker=dict(color='green', size=10, symbol='triangle-up')
-            ))
-        
-        if not sell_points.empty:
-            fig.add_trace(go.Scatter(
-                x=sell_points['Date'],
-                y=sell_points['Close'],
-                mode='markers',
-                name='Sell Signal',
-                marker=dict(color='red', size=10, symbol='triangle-down')
-            ))
+        with timer.stage("build_figures"):
+            fig = get_stock_figure(version, time_period, stock, high_volume, window_size, stock_data)
         
-        # Update layout
-        fig.update_layout(
-            title=f'{stock} - Price Analysis with Trading Signals',
-            xaxis_title='Date',
-            yaxis_title='Price (Rs.)',
-            hovermode='x unified',
-            height=400
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        with timer.stage("render_charts"):
+            st.plotly_chart(fig, use_container_width=True)
 
 # Summary section
 st.header("Summary")
 
 # Signal counts for selected date
-if not date_data.empty:
-    signal_summary = date_data['Signal'].value_counts()
+with timer.stage("render_summary"):
+    if not date_data.empty:
+        signal_summary = date_data['Signal'].value_counts()
     
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.metric("Buy Signals", signal_summary.get('Buy', 0))
-    with col2:
-        st.metric("Sell Signals", signal_summary.get('Sell', 0))
-    with col3:
-        st.metric("Hold Signals", signal_summary.get('Hold', 0))
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Buy Signals", signal_summary.get(BUY, 0))
+        with col2:
+            st.metric("Sell Signals", signal_summary.get(SELL, 0))
+        with col3:
+            st.metric("Hold Signals", signal_summary.get(HOLD, 0))
+
+# Backtest over the loaded history
+with timer.stage("render_backtest"):
+    with st.expander("Strategy Backtest"):
+        st.caption("Long after a BUY, short after a SELL, positions carried through HOLD days")
+        backtest_summary = get_backtest_summary(version, data)
+        percent_columns = ['Total_Return', 'Max_Drawdown', 'Hit_Rate']
+        st.dataframe(
+            backtest_summary.assign(**{name: backtest_summary[name] * 100 for name in percent_columns}),
+            hide_index=True,
+            column_config={
+                "Total_Return": st.column_config.NumberColumn("Total Return", format="%.2f%%"),
+                "PnL": st.column_config.NumberColumn("P&L (Rs./unit)", format="%.2f"),
+                "Invested_Days": st.column_config.NumberColumn("Invested Days"),
+                "Max_Drawdown": st.column_config.NumberColumn("Max Drawdown", format="%.2f%%"),
+                "Turnover": st.column_config.NumberColumn("Turnover", format="%.0f"),
+                "Hit_Rate": st.column_config.NumberColumn("Hit Rate", format="%.1f%%"),
+            }
+        )
 
 # Strategy explanation
 st.subheader("Trading Strategy")
-st.write("""
+st.write(f"""
 **Strategy Rules:**
-- **BUY**: When stock price falls below (10-day Moving Average - 1 Standard Deviation)
-- **SELL**: When stock price rises above (10-day Moving Average + 1 Standard Deviation)  
+- **BUY**: When stock price falls below ({window_size}-day Moving Average - 1 Standard Deviation)
+- **SELL**: When stock price rises above ({window_size}-day Moving Average + 1 Standard Deviation)  
 - **HOLD**: When stock price is within ±1 standard deviation of the moving average
 """)
 
 # Footer
 st.markdown("---")
-st.caption("Data source: Stock CSV files | Strategy: 10-day MA with ±1σ Bollinger Bands")
+st.caption(f"Data source: Stock CSV files | Strategy: {window_size}-day MA with ±1σ Bollinger Bands")
+
+# Diagnostics panel, drawn last so it includes every stage of this run
+if diagnostics:
+    with st.sidebar.expander("Diagnostics", expanded=True):
+        if st.button("Profile data load", help="Reload the CSV files outside the cache and record each stage"):
+            # A throwaway cache directory forces a full parse of every file
+            with tempfile.TemporaryDirectory() as cache_dir:
+                load_and_analyze_windows(
+                    DATA_DIR,
+                    WINDOW_SIZES,
+                    timer=timer,
+                    roll=None if incremental else PRICE_SERIES[price_series],
+                    dtype=dtype,
+                    cache_dir=cache_dir
+                )
+        timer.close()
+        
+        stage_records = pd.DataFrame(timer.records())
+        if stage_records.empty:
+            st.caption("No stages recorded yet")
+        else:
+            st.dataframe(
+                stage_records.assign(ms=stage_records['seconds'] * 1000).drop(columns='seconds'),
+                hide_index=True,
+                column_config={
+                    "ms": st.column_config.NumberColumn("Time (ms)", format="%.1f"),
+                    "net_mb": st.column_config.NumberColumn("Net MB", format="%.2f"),
+                    "peak_mb": st.column_config.NumberColumn("Peak MB", format="%.2f"),
+                }
+            )
+            st.download_button(
+                "Export JSON",
+                timer.to_json(data_version=version, rows=len(data)),
+                file_name="stage_timings.json",
+                mime="application/json"
+            )
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+from indicators import BUY, SELL
+
+
+def signal_positions(data, allow_short=True):
+    """Position held after each row: +1 from a Buy, -1 (or flat) from a Sell
+
+    Hold rows keep the previous position. ``data`` must be sorted by stock
+    and date, as returned by ``compute_indicators``.
+    """
+    signal = data['Signal'].to_numpy()
+    target = pd.Series(np.nan, index=data.index)
+    target[signal == BUY] = 1.0
+    target[signal == SELL] = -1.0 if allow_short else 0.0
+    return target.groupby(data['Stock'], sort=False, observed=True).ffill().fillna(0.0)
+
+
+def run_backtest(data, allow_short=True, cost_bps=0.0):
+    """Daily backtest of the band strategy for every stock at once
+
+    A signal seen on a day's close is traded at that close, so it earns the
+    next day's return. ``cost_bps`` is charged on every unit of position
+    change. Returns ``data`` with Position, Turnover, Return, Strategy_Return,
+    Equity and Drawdown columns added.
+    """
+    stocks = data['Stock']
+    by_stock = data.groupby('Stock', sort=False, observed=True)
+
+    position = signal_positions(data, allow_short=allow_short)
+    held = position.groupby(stocks, sort=False, observed=True).shift(1).fillna(0.0)
+    turnover = (position - held).abs()
+
+    returns = by_stock['Close'].pct_change().fillna(0.0)
+    strategy_returns = held * returns - turnover * (cost_bps / 10000)
+
+    equity = (1 + strategy_returns).groupby(stocks, sort=False, observed=True).cumprod()
+    peak = equity.groupby(stocks, sort=False, observed=True).cummax()
+
+    return data.assign(
+        Position=position,
+        Turnover=turnover,
+        Return=returns,
+        Strategy_Return=strategy_returns,
+        Equity=equity,
+        Drawdown=equity / peak - 1,
+    )
+
+
+def summarize_backtest(results):
+    """Per-stock metrics for the frame returned by ``run_backtest``
+
+    Total_Return is the compounded return, PnL the profit in rupees for one
+    unit held, Hit_Rate the share of invested days with a positive return,
+    Max_Drawdown the deepest fall from a previous equity peak and Turnover
+    the total position change.
+    """
+    stocks = results['Stock']
+    held = results['Position'].groupby(stocks, sort=False, observed=True).shift(1).fillna(0.0)
+    invested = held != 0
+
+    pnl = held * results.groupby('Stock', sort=False, observed=True)['Close'].diff().fillna(0.0)
+    frame = pd.DataFrame({
+        'Stock': stocks,
+        'Equity': results['Equity'],
+        'PnL': pnl,
+        'Invested': invested,
+        'Win': invested & (results['Strategy_Return'] > 0),
+        'Drawdown': results['Drawdown'],
+        'Turnover': results['Turnover'],
+    })
+
+    summary = frame.groupby('Stock', sort=False, observed=True).agg(
+        Total_Return=('Equity', 'last'),
+        PnL=('PnL', 'sum'),
+        Invested_Days=('Invested', 'sum'),
+        Winning_Days=('Win', 'sum'),
+        Max_Drawdown=('Drawdown', 'min'),
+        Turnover=('Turnover', 'sum'),
+    )
+    summary['Total_Return'] -= 1
+    summary['Hit_Rate'] = summary['Winning_Days'] / summary['Invested_Days'].where(summary['Invested_Days'] > 0)
+    return summary.drop(columns='Winning_Days').reset_index()
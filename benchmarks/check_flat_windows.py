@@ -0,0 +1,118 @@
+"""Check the fast indicator paths against compute_indicators on flat prices
+
+Trading halts repeat the same close for days. In such a window the std is 0
+and both bands equal the mean, so a mean even 1 ulp away from the close
+turns Hold into Buy or Sell. Random walks with repeated-close stretches (at
+ordinary and at low price levels, where the sums round more) are run
+through ``compute_window_indicators`` (the dashboard and ``sweep``) and
+``RollingBands`` (live feeds), and their signals must equal those of
+``compute_indicators``. The same prices are also written as bhavcopy CSV
+files and ``analysis.analyze_store`` (SQL windows) must give the signals of
+``load_and_analyze_data``. The script exits with status 1 on any
+difference.
+
+    python benchmarks/check_flat_windows.py --stocks 200 --days 2000
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from analysis import analyze_store, load_and_analyze_data  # noqa: E402
+from benchmarks.synthetic import DATE_FORMAT, HEADER  # noqa: E402
+from indicators import RollingBands, compute_indicators, compute_window_indicators  # noqa: E402
+from store import BhavcopyStore  # noqa: E402
+
+
+def flat_series(n_stocks, n_days, flat_days=15, seed=0):
+    """Random-walk closes per stock, each with stretches of a repeated close"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2010-01-01', periods=n_days)
+    frames = []
+    for i in range(n_stocks):
+        level, step = (5.0, 0.01) if i % 2 else (100.0, 1.0)
+        closes = level + rng.normal(0, step, n_days).cumsum()
+        for start in range(int(rng.integers(0, 100)), n_days, 300):
+            closes[start:start + flat_days] = closes[start]
+        frames.append(pd.DataFrame({'Date': dates, 'Stock': f'S{i:03d}', 'Close': closes}))
+    return pd.concat(frames, ignore_index=True).astype({'Stock': 'category'})
+
+
+def rolling_bands_signals(df, window_size):
+    signals = []
+    for _, rows in df.groupby('Stock', sort=False, observed=True):
+        bands = RollingBands(window_size)
+        signals.extend(bands.update(close)['Signal'] for close in rows['Close'])
+    return np.array(signals)
+
+
+def write_csv_files(df, out_dir):
+    """One single-contract bhavcopy CSV per stock with the Close of ``df``
+
+    Prices keep six decimals: with two, many closes land exactly on a band
+    and the SQL and pandas sums round such ties differently.
+    """
+    for stock, rows in df.groupby('Stock', observed=True):
+        close = rows['Close']
+        columns = {
+            'Symbol': stock,
+            'Date': rows['Date'].dt.strftime(DATE_FORMAT),
+            'Expiry': (rows['Date'] + pd.Timedelta(days=90)).dt.strftime(DATE_FORMAT),
+        }
+        for name in ['Open', 'High', 'Low', 'Close', 'LTP', 'Settle Price']:
+            columns[name] = close
+        for name in ['No. of contracts', 'Turnover', 'Open Int', 'Change in OI']:
+            columns[name] = 1.0
+        columns['Underlying Value'] = close
+        with open(os.path.join(out_dir, f'{stock}.csv'), 'w', encoding='utf-8', newline='') as f:
+            f.write(HEADER + '\n')
+            pd.DataFrame(columns).to_csv(f, header=False, index=False, float_format='%.6f', lineterminator='\n')
+
+
+def store_flips(df, windows):
+    """Signals of ``analyze_store`` differing from ``load_and_analyze_data``"""
+    with tempfile.TemporaryDirectory() as tmp:
+        write_csv_files(df, tmp)
+        with BhavcopyStore(os.path.join(tmp, 'store.sqlite')) as store:
+            store.ingest(tmp)
+            flips = {}
+            for window in windows:
+                expected = load_and_analyze_data(tmp, window_size=window).sort_values(['Stock', 'Date'])
+                actual = analyze_store(store, window_size=window).sort_values(['Stock', 'Date'])
+                flips[window] = int((actual['Signal'].to_numpy() != expected['Signal'].to_numpy()).sum())
+    return flips
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stocks', type=int, default=50)
+    parser.add_argument('--days', type=int, default=2000)
+    parser.add_argument('--windows', type=int, nargs='+', default=[5, 10, 20])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    df = flat_series(args.stocks, args.days, seed=args.seed)
+    windows = compute_window_indicators(df, args.windows)
+    from_store = store_flips(df, args.windows)
+
+    failed = False
+    for window in args.windows:
+        expected = compute_indicators(df, window_size=window)['Signal'].to_numpy()
+        flips = {
+            'compute_window_indicators': int((windows[window]['Signal'].to_numpy() != expected).sum()),
+            'RollingBands': int((rolling_bands_signals(df, window) != expected).sum()),
+            'analyze_store': from_store[window],
+        }
+        failed |= any(flips.values())
+        print(f"window {window:>3}  " + '  '.join(f"{name} {count} flips" for name, count in flips.items()))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""Check float32 indicator columns against float64 results
+
+The pipeline is run twice on the same data, once per precision, for every
+window size. Signals must be identical and each indicator column must
+match its float64 value within ``indicators.FLOAT32_RTOL``; values near
+zero (Std_Deviations) are compared with the same bound as an absolute
+tolerance. The script reports the memory saved and exits with status 1 on
+any mismatch.
+
+    python benchmarks/check_float32.py --symbols 50 --days 750
+    python benchmarks/check_float32.py --data-dir data
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+from analysis import load_data  # noqa: E402
+from benchmarks.synthetic import write_bhavcopy_files  # noqa: E402
+from indicators import FLOAT32_RTOL, INDICATOR_COLUMNS, compute_window_indicators  # noqa: E402
+
+FLOAT_COLUMNS = [name for name in INDICATOR_COLUMNS if name != 'Signal']
+
+
+def compare(exact, single):
+    """Largest relative error per float column and whether signals agree"""
+    errors = {}
+    for name in FLOAT_COLUMNS:
+        expected = exact[name].to_numpy()
+        actual = single[name].to_numpy().astype('float64')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            error = np.abs(actual - expected) / np.maximum(np.abs(expected), 1.0)
+        same_nan = np.array_equal(np.isnan(expected), np.isnan(actual))
+        errors[name] = float(np.nanmax(error, initial=0.0)) if same_nan else float('inf')
+    return errors, exact['Signal'].equals(single['Signal'])
+
+
+def check(data, windows):
+    exact = compute_window_indicators(data, windows)
+    single = compute_window_indicators(data, windows, dtype='float32')
+
+    failed = False
+    for window in windows:
+        errors, same_signals = compare(exact[window], single[window])
+        worst = max(errors, key=errors.get)
+        status = 'ok'
+        if errors[worst] > FLOAT32_RTOL or not same_signals:
+            status = 'signals differ' if not same_signals else f'{worst} over tolerance'
+            failed = True
+        print(f"window {window:>3}  max rel error {errors[worst]:.2e} ({worst})  {status}")
+
+    exact_mb = sum(exact[w][FLOAT_COLUMNS].memory_usage(index=False).sum() for w in windows) / 2**20
+    single_mb = sum(single[w][FLOAT_COLUMNS].memory_usage(index=False).sum() for w in windows) / 2**20
+    print(f"indicator columns: {exact_mb:.1f} MB float64, {single_mb:.1f} MB float32 (tolerance {FLOAT32_RTOL:g})")
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data-dir', help="existing CSV directory (default: generate synthetic data)")
+    parser.add_argument('--symbols', type=int, default=50)
+    parser.add_argument('--days', type=int, default=750)
+    parser.add_argument('--windows', type=int, nargs='+', default=[5, 10, 20, 60])
+    args = parser.parse_args(argv)
+
+    if args.data_dir:
+        data = load_data(args.data_dir)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            write_bhavcopy_files(tmp, args.symbols, args.days)
+            data = load_data(tmp)
+    if data.empty:
+        print("No data available. Please check your CSV files.", file=sys.stderr)
+        return 1
+    return 1 if check(data, args.windows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
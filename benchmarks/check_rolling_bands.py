@@ -0,0 +1,77 @@
+"""Check RollingBands against compute_indicators on series with NaN closes
+
+A random walk with a share of missing closes (single gaps and a run longer
+than any window) is fed one price at a time to
+``indicators.RollingBands``, both from an empty state and primed with
+``from_history``. Every row must match pandas' rolling statistics within
+``--rtol`` and give the same signal. The default of 1e-6 leaves room for
+cancellation in the std when the closes in a window nearly coincide. The
+script exits with status 1 on any mismatch. Flat windows are left out
+(``check_flat_windows.py`` covers them): RollingBands reports their exact
+mean and a std of 0, where pandas can keep the rounding residue of earlier
+prices.
+
+    python benchmarks/check_rolling_bands.py --length 2000 --nan-share 0.1
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from indicators import INDICATOR_COLUMNS, RollingBands, compute_indicators  # noqa: E402
+
+FLOAT_COLUMNS = [name for name in INDICATOR_COLUMNS if name != 'Signal']
+
+
+def sample_series(length, nan_share, rng):
+    """Random-walk closes with scattered NaNs and a long NaN run"""
+    closes = 100 + rng.normal(0, 1, length).cumsum()
+    closes[rng.random(length) < nan_share] = np.nan
+    closes[length // 3:length // 3 + 25] = np.nan
+    return closes
+
+
+def mismatches(closes, window_size, rtol, primed=0):
+    """Names of the fields where RollingBands differs from pandas"""
+    df = pd.DataFrame({'Date': pd.bdate_range('2020-01-01', periods=len(closes)), 'Stock': 'X', 'Close': closes})
+    expected = compute_indicators(df, window_size=window_size).iloc[primed:]
+
+    bands = RollingBands.from_history(closes[:primed], window_size=window_size)
+    actual = pd.DataFrame([bands.update(close) for close in closes[primed:]])
+
+    failed = [
+        name for name in FLOAT_COLUMNS
+        if not np.allclose(actual[name], expected[name], rtol=rtol, atol=rtol, equal_nan=True)
+    ]
+    if not np.array_equal(actual['Signal'].to_numpy(), expected['Signal'].to_numpy()):
+        failed.append('Signal')
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--length', type=int, default=2000)
+    parser.add_argument('--nan-share', type=float, default=0.1, help="share of closes set to NaN (default: 0.1)")
+    parser.add_argument('--windows', type=int, nargs='+', default=[2, 5, 10, 20])
+    parser.add_argument('--rtol', type=float, default=1e-6)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    closes = sample_series(args.length, args.nan_share, np.random.default_rng(args.seed))
+    failed = False
+    for window in args.windows:
+        for primed in (0, args.length // 3 + 5):
+            wrong = mismatches(closes, window, args.rtol, primed)
+            failed |= bool(wrong)
+            status = f"differs in {', '.join(wrong)}" if wrong else 'ok'
+            print(f"window {window:>3}  primed with {primed:>4} closes  {status}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Check that the core signal path imports quickly and without UI packages
+
+Each module is imported in a fresh interpreter with ``-X importtime`` and
+its cumulative import time is compared with the budget. The default budget
+sits just above the current cost (about 450-650 ms per module here), so
+machines much slower or faster than that should compare against a saved
+baseline instead, where each module may be ``--tolerance`` slower than it
+was. The script exits with status 1 if a module is over budget or pulls in
+Streamlit or Plotly.
+
+    python benchmarks/import_budget.py --json imports.json
+    python benchmarks/import_budget.py --baseline imports.json --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules the headless signal path (CLI, API, batch jobs) imports
+CORE_MODULES = ['analysis', 'backtest', 'charts', 'cli', 'incremental', 'signal_index', 'sweep']
+# Packages that must only be imported by the dashboard or when drawing charts
+UI_PACKAGES = ['streamlit', 'plotly']
+# Reference point: what the dashboard pays before drawing anything
+DASHBOARD_IMPORTS = 'streamlit, plotly.graph_objects'
+
+
+def import_time_ms(statement, runs=3):
+    """Best-of-``runs`` cumulative import time of ``import <statement>``"""
+    best = None
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {statement}'],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        total = 0
+        for line in result.stderr.splitlines():
+            # "import time: self [us] | cumulative | imported package"
+            parts = line.split('|')
+            if len(parts) == 3 and not parts[2].startswith('  '):
+                cumulative = parts[1].strip()
+                if cumulative.isdigit():
+                    total += int(cumulative)
+        best = total if best is None else min(best, total)
+    return best / 1000
+
+
+def imported_ui_packages(module):
+    code = f'import sys, {module}; print(" ".join(p for p in {UI_PACKAGES!r} if p in sys.modules))'
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=750, help="per-module import budget (default: 750)")
+    parser.add_argument('--runs', type=int, default=3, help="imports per module, best is kept (default: 3)")
+    parser.add_argument('--json', help="write import times to this file")
+    parser.add_argument('--baseline', help="file from an earlier --json run; replaces --budget-ms")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown over the baseline (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    budgets = {}
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            budgets = {row['module']: row['ms'] * (1 + args.tolerance) for row in json.load(f)['results']}
+
+    dashboard_ms = import_time_ms(DASHBOARD_IMPORTS, args.runs)
+    print(f"{'dashboard (' + DASHBOARD_IMPORTS + ')':<40} {dashboard_ms:8.1f} ms")
+
+    failed = False
+    results = []
+    for module in CORE_MODULES:
+        elapsed_ms = import_time_ms(module, args.runs)
+        results.append({'module': module, 'ms': elapsed_ms})
+        budget_ms = budgets.get(module, args.budget_ms)
+        leaked = imported_ui_packages(module)
+        status = 'ok'
+        if elapsed_ms > budget_ms:
+            status = f'OVER BUDGET ({budget_ms:.0f} ms)'
+            failed = True
+        if leaked:
+            status = f"imports {', '.join(leaked)}"
+            failed = True
+        print(f"{module:<40} {elapsed_ms:8.1f} ms  {elapsed_ms / dashboard_ms:5.0%} of dashboard  {status}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'dashboard_ms': dashboard_ms, 'results': results}, f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""Time and measure peak memory of each stage of the signal pipeline
+
+Synthetic bhavcopy files are generated for N symbols x M days (or an
+existing directory is used) and every stage is timed on them: CSV parsing,
+front-month selection, continuous-series stitching, cold and cached
+loading, indicator computation, date lookups, chart building and the
+backtest. Wall time is the best of
+``--repeat`` runs; peak memory is the largest traced Python/NumPy
+allocation during one extra run under tracemalloc.
+
+    python benchmarks/run_benchmarks.py --symbols 200 --days 750 --json bench.json
+    python benchmarks/run_benchmarks.py --baseline bench.json --tolerance 0.25
+
+With ``--baseline`` the script exits with status 1 if a stage got slower
+than the baseline by more than the tolerance.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd  # noqa: E402
+
+from backtest import run_backtest, summarize_backtest  # noqa: E402
+from benchmarks.synthetic import write_bhavcopy_files  # noqa: E402
+from continuous import build_continuous  # noqa: E402
+from indicators import compute_indicators, compute_window_indicators  # noqa: E402
+from loader import discover_files, load_stock_files, read_bhavcopy, select_front_month  # noqa: E402
+from signal_index import DateSignalIndex  # noqa: E402
+
+
+def measure(func, repeat):
+    """(best wall time in seconds, traced peak bytes, result) of ``func()``"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak, result
+
+
+def run(data_dir, repeat=3, chart_stocks=20, engine=None):
+    files = discover_files(data_dir)
+    paths = [path for _, path in files]
+    results = []
+
+    def record(stage, func):
+        seconds, peak, value = measure(func, repeat)
+        results.append({'stage': stage, 'seconds': seconds, 'peak_mb': peak / 2**20})
+        print(f"{stage:<22} {seconds * 1000:10.1f} ms  {peak / 2**20:9.1f} MB", flush=True)
+        return value
+
+    raw = record('parse', lambda: [read_bhavcopy(path, engine=engine) for path in paths])
+    front = record('front_month', lambda: [select_front_month(df) for df in raw])
+    record('continuous', lambda: [build_continuous(df, days=3) for df in raw])
+    del raw
+
+    cache_dir = tempfile.mkdtemp(prefix='bench-cache-')
+    try:
+        def cold_load():
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            return load_stock_files(files, cache_dir=cache_dir)
+
+        record('load_cold', cold_load)
+        dfs = record('load_cached', lambda: load_stock_files(files, cache_dir=cache_dir))
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    del front
+
+    combined = pd.concat(dfs, ignore_index=True)
+    data = record('indicators', lambda: compute_indicators(combined))
+    record('indicators_5_windows', lambda: compute_window_indicators(combined, (5, 10, 20, 30, 50)))
+
+    index = record('date_index_build', lambda: DateSignalIndex(data))
+    dates = index.dates
+
+    def lookups():
+        for date in dates:
+            index.signals(date)
+        return len(dates)
+
+    record('date_lookup_all', lookups)
+
+    try:
+        from charts import build_stock_figure
+    except ImportError:
+        print(f"{'charts':<22} skipped (plotly not installed)")
+    else:
+        stocks = [stock for stock, _ in files[:chart_stocks]]
+        by_stock = {stock: rows for stock, rows in data.groupby('Stock', sort=False, observed=True)}
+        record('charts', lambda: [build_stock_figure(stock, by_stock[stock]) for stock in stocks])
+        record('charts_high_volume', lambda: [
+            build_stock_figure(stock, by_stock[stock], high_volume=True) for stock in stocks
+        ])
+
+    record('backtest', lambda: summarize_backtest(run_backtest(data)))
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Names of stages slower than ``baseline`` by more than ``tolerance``"""
+    previous = {row['stage']: row['seconds'] for row in baseline['results']}
+    slower = []
+    for row in results:
+        before = previous.get(row['stage'])
+        if before and row['seconds'] > before * (1 + tolerance):
+            slower.append(row['stage'])
+            print(f"REGRESSION {row['stage']}: {before * 1000:.1f} ms -> {row['seconds'] * 1000:.1f} ms")
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the signal pipeline")
+    parser.add_argument('--data-dir', help="benchmark existing CSV files instead of synthetic ones")
+    parser.add_argument('--symbols', type=int, default=50)
+    parser.add_argument('--days', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--chart-stocks', type=int, default=20, help="stocks charted in the chart stages")
+    parser.add_argument('--engine', choices=['pyarrow', 'c'], help="CSV engine (default: pyarrow if installed)")
+    parser.add_argument('--json', help="write results to this file")
+    parser.add_argument('--baseline', help="results file from an earlier run to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    data_dir = args.data_dir
+    generated = None
+    if data_dir is None:
+        generated = data_dir = tempfile.mkdtemp(prefix='bench-data-')
+        print(f"Generating {args.symbols} symbols x {args.days} days in {data_dir}")
+        write_bhavcopy_files(data_dir, args.symbols, args.days)
+
+    try:
+        results = run(data_dir, args.repeat, args.chart_stocks, args.engine)
+    finally:
+        if generated:
+            shutil.rmtree(generated, ignore_errors=True)
+
+    report = {
+        'symbols': args.symbols if generated else None,
+        'days': args.days if generated else None,
+        'data_dir': None if generated else data_dir,
+        'results': results,
+    }
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
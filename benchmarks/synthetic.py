@@ -0,0 +1,110 @@
+"""Synthetic bhavcopy CSV files for benchmarks
+
+Files follow the layout of the real exports: the same padded header,
+``%d-%b-%Y`` dates and one row per live contract (the nearest monthly
+expiries, which fall on the last Thursday of the month) for every trading
+day. Prices are a random walk per symbol.
+
+    python benchmarks/synthetic.py /tmp/bhavcopy --symbols 200 --days 750
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+HEADER = (
+    'Symbol  ,Date  ,Expiry  ,Open  ,High  ,Low  ,Close  ,LTP  ,Settle Price  ,No. of contracts  ,'
+    'Turnover * in   ₹ Lakhs,Open Int  ,Change in OI  ,Underlying Value  '
+)
+DATE_FORMAT = '%d-%b-%Y'
+
+
+def monthly_expiries(start, end):
+    """Last Thursday of every month from ``start`` until after ``end``"""
+    # Month ends as the day before each month start; 'MS' is understood by
+    # every supported pandas, unlike 'ME' (2.2+) and 'M' (removed in 3.0)
+    day = pd.Timedelta(days=1)
+    month_starts = pd.date_range(pd.Timestamp(start) + day, pd.Timestamp(end) + pd.DateOffset(months=4) + day, freq='MS')
+    month_ends = month_starts - day
+    # Step back from each month end to its Thursday (weekday 3)
+    return month_ends - pd.to_timedelta((month_ends.weekday - 3) % 7, unit='D')
+
+
+def symbol_frame(symbol, dates, expiries, contracts=3, rng=None):
+    """All contract rows for one symbol, sorted by Date then Expiry"""
+    rng = rng if rng is not None else np.random.default_rng()
+    n_days = len(dates)
+
+    underlying = rng.uniform(50, 3000) * np.exp(np.cumsum(rng.normal(0, 0.015, n_days)))
+    first = np.searchsorted(expiries.values, dates.values)
+    expiry_index = first[:, None] + np.arange(contracts)
+
+    day = np.repeat(np.arange(n_days), contracts)
+    expiry = expiries.values[expiry_index.ravel()]
+    carry = 1 + 0.004 * (expiry_index.ravel() - first[day] + 1)
+    close = underlying[day] * carry * (1 + rng.normal(0, 0.002, len(day)))
+    open_ = close * (1 + rng.normal(0, 0.005, len(day)))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, len(day)))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, len(day)))
+    contracts_traded = rng.integers(100, 50000, len(day)).astype('float64')
+    open_interest = rng.integers(10000, 100000000, len(day)).astype('float64')
+
+    return pd.DataFrame({
+        'Symbol': symbol,
+        'Date': dates.values[day],
+        'Expiry': expiry,
+        'Open': open_,
+        'High': high,
+        'Low': low,
+        'Close': close,
+        'LTP': close * (1 + rng.normal(0, 0.0005, len(day))),
+        'Settle Price': close,
+        'No. of contracts': contracts_traded,
+        'Turnover * in   ₹ Lakhs': contracts_traded * close / 100,
+        'Open Int': open_interest,
+        'Change in OI': rng.normal(0, 1e6, len(day)).round(),
+        'Underlying Value': underlying[day],
+    })
+
+
+def write_bhavcopy_files(out_dir, n_symbols=200, n_days=250, contracts=3, start='2022-01-03', seed=0):
+    """Write ``n_symbols`` CSV files of ``n_days`` trading days each
+
+    Returns the list of written paths.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, periods=n_days)
+    expiries = monthly_expiries(dates[0], dates[-1])
+
+    paths = []
+    for i in range(n_symbols):
+        symbol = f'SYM{i:04d}'
+        df = symbol_frame(symbol, dates, expiries, contracts=contracts, rng=rng)
+        df['Date'] = df['Date'].dt.strftime(DATE_FORMAT)
+        df['Expiry'] = df['Expiry'].dt.strftime(DATE_FORMAT)
+
+        path = os.path.join(out_dir, f'{symbol}.csv')
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(HEADER + '\n')
+            df.to_csv(f, header=False, index=False, float_format='%.2f', lineterminator='\n')
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write synthetic bhavcopy CSV files")
+    parser.add_argument('out_dir')
+    parser.add_argument('--symbols', type=int, default=200)
+    parser.add_argument('--days', type=int, default=250)
+    parser.add_argument('--contracts', type=int, default=3, help="expiries listed per day (default: 3)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    paths = write_bhavcopy_files(args.out_dir, args.symbols, args.days, args.contracts, seed=args.seed)
+    print(f"Wrote {len(paths)} files to {args.out_dir}")
+
+
+if __name__ == '__main__':
+    main()
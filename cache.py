@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import tempfile
+
+from instrumentation import stage
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - cache is simply disabled without pyarrow
+    pa = None
+    feather = None
+
+CACHE_DIR = '.cache'
+_META_KEY = b'stocks.source'
+
+
+def _fingerprint(path, version):
+    """Identify a source file by absolute path, size and modification time"""
+    stat = os.stat(path)
+    return {
+        'path': os.path.abspath(path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'version': version,
+    }
+
+
+def _cache_path(path, cache_dir, version=None):
+    # One entry per source file and version, so frames built differently from
+    # the same file (front month, continuous series) don't evict each other
+    key = hashlib.sha1(f'{os.path.abspath(path)}\0{version}'.encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, f'{key}.feather')
+
+
+def _read_fingerprint(cache_path):
+    with pa.memory_map(cache_path) as source:
+        metadata = pa.ipc.open_file(source).schema.metadata or {}
+    raw = metadata.get(_META_KEY)
+    return json.loads(raw) if raw else None
+
+
+def load_cached(path, parse, cache_dir=CACHE_DIR, version=None, timer=None):
+    """Return ``parse(path)``, reusing a Feather copy while the file is unchanged
+
+    The cached frame is stored as an Arrow IPC (Feather v2) file and read back
+    memory-mapped. It is rebuilt whenever the source path, size or mtime
+    differ from the ones recorded alongside it, or when ``version`` (bumped by
+    callers whenever ``parse`` changes its output) does not match. Each
+    ``version`` has its own entry, so alternating between them stays cached.
+    Without pyarrow the source file is parsed every time. Cache reads and
+    writes are recorded on ``timer`` when one is given.
+    """
+    if feather is None:
+        return parse(path)
+
+    fingerprint = _fingerprint(path, version)
+    cache_path = _cache_path(path, cache_dir, version)
+
+    if os.path.exists(cache_path):
+        try:
+            if _read_fingerprint(cache_path) == fingerprint:
+                with stage(timer, 'cache_read'):
+                    return feather.read_table(cache_path, memory_map=True).to_pandas()
+        except (OSError, ValueError, pa.ArrowException):
+            pass  # Unreadable cache entry, rebuild it below
+
+    df = parse(path)
+
+    with stage(timer, 'cache_write'):
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            metadata[_META_KEY] = json.dumps(fingerprint).encode('utf-8')
+            table = table.replace_schema_metadata(metadata)
+
+            # Write to a unique temporary file first so readers never see a
+            # partial entry and concurrent writers (threads included) don't mix
+            fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=cache_dir)
+            try:
+                with os.fdopen(fd, 'wb') as sink:
+                    feather.write_feather(table, sink, compression='uncompressed')
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        except (OSError, pa.ArrowException):
+            pass  # Caching is best effort
+
+    return df
+
+
+def clear_cache(cache_dir=CACHE_DIR):
+    """Delete every cached frame in ``cache_dir``"""
+    if not os.path.isdir(cache_dir):
+        return
+    for name in os.listdir(cache_dir):
+        if name.endswith('.feather'):
+            os.remove(os.path.join(cache_dir, name))
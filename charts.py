@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+
+from indicators import BUY, SELL
+
+# Rough number of points a chart can show per line before they overlap
+MAX_POINTS = 1000
+
+
+def stock_frames(data, days=None):
+    """Rows of ``data`` per stock, limited to the last ``days`` calendar days"""
+    if days is not None:
+        cutoff_date = data['Date'].max() - pd.Timedelta(days=days)
+        data = data[data['Date'] >= cutoff_date]
+    return {stock: stock_data for stock, stock_data in data.groupby('Stock', sort=False, observed=True)}
+
+
+def lttb_indices(x, y, threshold):
+    """Positions kept by Largest-Triangle-Three-Buckets downsampling
+
+    Always keeps the first and last point, and from every bucket in between
+    the point forming the largest triangle with its neighbours, which keeps
+    the visual shape (peaks and troughs) of the series.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    # Bucket edges for the n - 2 interior points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0] = 0
+    kept[-1] = n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = np.nanmean(y[next_start:next_end]) if next_end > next_start else y[-1]
+
+        areas = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.nanargmax(areas)) if not np.isnan(areas).all() else start
+        kept[i + 1] = previous
+    return kept
+
+
+def build_stock_figure(stock, stock_data, high_volume=False, max_points=MAX_POINTS, window_size=10):
+    """Price, MA, band and signal chart for one stock
+
+    ``high_volume`` switches to WebGL traces and LTTB-downsamples the line
+    traces to about ``max_points`` points. Buy/Sell markers are always drawn
+    from the full data.
+    """
+    # Plotly is slow to import, so only load it once a chart is drawn
+    import plotly.graph_objects as go
+
+    scatter = go.Scattergl if high_volume else go.Scatter
+    lines = stock_data
+    if high_volume and len(stock_data) > max_points:
+        kept = lttb_indices(stock_data['Date'].to_numpy().astype('int64'), stock_data['Close'].to_numpy(), max_points)
+        lines = stock_data.iloc[kept]
+
+    fig = go.Figure()
+    
+    # Add price line
+    fig.add_trace(scatter(
+        x=lines['Date'],
+        y=lines['Close'],
+        mode='lines' if high_volume else 'lines+markers',
+        name='Close Price',
+        line=dict(color='blue', width=2)
+    ))
+    
+    # Add moving average
+    fig.add_trace(scatter(
+        x=lines['Date'],
+        y=lines['MA_10'],
+        mode='lines',
+        name=f'{window_size}-Day MA',
+        line=dict(color='orange', dash='dash')
+    ))
+    
+    # Add Bollinger Bands
+    fig.add_trace(scatter(
+        x=lines['Date'],
+        y=lines['Upper_Band'],
+        mode='lines',
+        name='Upper Band (+1σ)',
+        line=dict(color='red', dash='dot'),
+        showlegend=False
+    ))
+    
+    fig.add_trace(scatter(
+        x=lines['Date'],
+        y=lines['Lower_Band'],
+        mode='lines',
+        name='Lower Band (-1σ)',
+        line=dict(color='green', dash='dot'),
+        fill='tonexty',
+        fillcolor='rgba(128,128,128,0.1)',
+        showlegend=True
+    ))
+    
+    # Add buy/sell signals
+    buy_points = stock_data[stock_data['Signal'] == BUY]
+    sell_points = stock_data[stock_data['Signal'] == SELL]
+    
+    if not buy_points.empty:
+        fig.add_trace(scatter(
+            x=buy_points['Date'],
+            y=buy_points['Close'],
+            mode='markers',
+            name='Buy Signal',
+            marker=dict(color='green', size=10, symbol='triangle-up')
+        ))
+    
+    if not sell_points.empty:
+        fig.add_trace(scatter(
+            x=sell_points['Date'],
+            y=sell_points['Close'],
+            mode='markers',
+            name='Sell Signal',
+            marker=dict(color='red', size=10, symbol='triangle-down')
+        ))
+    
+    # Update layout
+    fig.update_layout(
+        title=f'{stock} - Price Analysis with Trading Signals',
+        xaxis_title='Date',
+        yaxis_title='Price (Rs.)',
+        hovermode='x unified',
+        height=400
+    )
+    return fig
@@ -0,0 +1,220 @@
+"""Command-line access to the signal table without starting Streamlit
+
+Examples::
+
+    python cli.py signals --date 2025-07-01
+    python cli.py signals --start 2025-06-16 --end 2025-06-30 -o june.parquet
+    python cli.py sweep --windows 5 10 20 --multipliers 1 2 -o sweep.csv
+    python cli.py stream signals/ --chunk-rows 50000
+"""
+import argparse
+import os
+import sys
+from datetime import date
+
+from loader import DATA_DIR
+from store import STORE_PATH
+
+FORMATS = ('csv', 'parquet', 'json')
+
+
+def _date(value):
+    """argparse type for YYYY-MM-DD dates"""
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date {value!r}, expected YYYY-MM-DD") from None
+
+
+def _output_format(args):
+    if args.format:
+        return args.format
+    if args.output:
+        extension = os.path.splitext(args.output)[1].lstrip('.').lower()
+        if extension in FORMATS:
+            return extension
+    return 'csv'
+
+
+def write_frame(df, output=None, fmt='csv'):
+    """Write ``df`` to ``output`` (stdout when None) as csv, parquet or json"""
+    if fmt == 'parquet':
+        if output is None:
+            raise SystemExit("Parquet output needs --output")
+        df.to_parquet(output, index=False)
+    elif fmt == 'json':
+        df.to_json(output if output is not None else sys.stdout, orient='records', date_format='iso', lines=True)
+    else:
+        df.to_csv(output if output is not None else sys.stdout, index=False)
+
+
+def _roll(args):
+    """Continuous series options for the loader, or None for front month"""
+    if args.roll is None:
+        return None
+    return {'rule': args.roll, 'days': args.roll_days, 'adjust': None if args.adjust == 'none' else args.adjust}
+
+
+def _dtype(args):
+    return 'float32' if args.float32 else 'float64'
+
+
+def _signals_from_store(args):
+    from analysis import analyze_store
+    from store import BhavcopyStore
+
+    with BhavcopyStore(args.store) as store:
+        store.ingest(args.data_dir)
+        latest = store.latest_date()
+        if latest is None:
+            return None
+
+        if args.date:
+            start = end = args.date
+        elif args.start or args.end:
+            start, end = args.start, args.end
+        else:
+            start = end = latest
+        return analyze_store(store, window_size=args.window, num_std=args.num_std,
+                             symbols=args.stock, start=start, end=end, dtype=_dtype(args))
+
+
+def run_signals(args):
+    from analysis import SIGNAL_COLUMNS, load_and_analyze_data, select_dates
+    from indicators import SIGNAL_CODES, with_signal_labels
+
+    def warn_missing(path):
+        print(f"File {path} not found!", file=sys.stderr)
+
+    if args.store:
+        if args.roll:
+            raise SystemExit("--store uses the front-month contract and cannot be combined with --roll")
+        signals = _signals_from_store(args)
+        if signals is None:
+            print("No data available. Please check your CSV files.", file=sys.stderr)
+            return 1
+        signals = signals[SIGNAL_COLUMNS]
+    else:
+        data = load_and_analyze_data(
+            args.data_dir, window_size=args.window, num_std=args.num_std, on_missing=warn_missing, roll=_roll(args),
+            dtype=_dtype(args),
+        )
+        if data.empty:
+            print("No data available. Please check your CSV files.", file=sys.stderr)
+            return 1
+
+        if args.date:
+            start = end = args.date
+        elif args.start or args.end:
+            start, end = args.start, args.end
+        else:
+            start = end = data['Date'].max()
+
+        signals = select_dates(data, start, end)[SIGNAL_COLUMNS]
+        if args.stock:
+            signals = signals[signals['Stock'].isin(args.stock)]
+
+    if args.signal:
+        signals = signals[signals['Signal'].isin([SIGNAL_CODES[label] for label in args.signal])]
+    write_frame(with_signal_labels(signals.sort_values(['Date', 'Stock'])), args.output, _output_format(args))
+    return 0
+
+
+def run_sweep(args):
+    from analysis import load_data
+    from sweep import sweep
+
+    data = load_data(args.data_dir, roll=_roll(args))
+    if data.empty:
+        print("No data available. Please check your CSV files.", file=sys.stderr)
+        return 1
+
+    results = sweep(
+        data,
+        windows=args.windows,
+        multipliers=args.multipliers,
+        allow_short=not args.long_only,
+        cost_bps=args.cost_bps,
+        max_workers=args.workers,
+    )
+    write_frame(results, args.output, _output_format(args))
+    return 0
+
+
+def run_stream(args):
+    from streaming import stream_analyze
+
+    def warn_missing(path):
+        print(f"File {path} not found!", file=sys.stderr)
+
+    chunks = stream_analyze(
+        args.data_dir, args.out_dir, window_size=args.window, num_std=args.num_std,
+        chunk_rows=args.chunk_rows, on_missing=warn_missing, dtype=_dtype(args),
+    )
+    print(f"Wrote {chunks} chunks to {args.out_dir}", file=sys.stderr)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Stock trading signals from bhavcopy CSV files")
+    parser.add_argument('--data-dir', default=DATA_DIR, help="directory holding the stock CSV files")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    signals = subparsers.add_parser('signals', help="write the signal table for a date or date range")
+    dates = signals.add_mutually_exclusive_group()
+    dates.add_argument('--date', type=_date, help="single date (YYYY-MM-DD); defaults to the latest date")
+    dates.add_argument('--start', type=_date, help="first date of a range (YYYY-MM-DD)")
+    signals.add_argument('--end', type=_date, help="last date of a range (YYYY-MM-DD)")
+    signals.add_argument('--signal', nargs='+', choices=['Buy', 'Sell', 'Hold'], help="only keep these signals")
+    signals.add_argument('--stock', nargs='+', help="only keep these stocks")
+    signals.add_argument('--window', type=int, default=10, help="moving average window (default: 10)")
+    signals.add_argument('--num-std', type=float, default=1, help="band width in standard deviations (default: 1)")
+    signals.add_argument('--store', nargs='?', const=STORE_PATH, metavar='PATH',
+                         help="query an SQLite store of the CSV files, updated first, so only the "
+                              f"requested rows are loaded (default path: {STORE_PATH})")
+    signals.set_defaults(func=run_signals)
+
+    sweep = subparsers.add_parser('sweep', help="backtest a grid of windows and band widths")
+    sweep.add_argument('--windows', type=int, nargs='+', default=list(range(5, 65, 5)))
+    sweep.add_argument('--multipliers', type=float, nargs='+', default=[0.5, 1.0, 1.5, 2.0, 2.5, 3.0])
+    sweep.add_argument('--long-only', action='store_true', help="go flat instead of short on SELL")
+    sweep.add_argument('--cost-bps', type=float, default=0.0, help="cost per unit of position change")
+    sweep.add_argument('--workers', type=int, default=None, help="worker processes (default: one per CPU)")
+    sweep.set_defaults(func=run_sweep)
+
+    stream = subparsers.add_parser('stream', help="analyze chunk by chunk into a partitioned Parquet dataset")
+    stream.add_argument('out_dir', help="output directory, partitioned as Stock=<name>/Month=<YYYY-MM>")
+    stream.add_argument('--window', type=int, default=10, help="moving average window (default: 10)")
+    stream.add_argument('--num-std', type=float, default=1, help="band width in standard deviations (default: 1)")
+    stream.add_argument('--chunk-rows', type=int, default=100_000,
+                        help="CSV lines read at a time; bounds peak memory (default: 100000)")
+    stream.set_defaults(func=run_stream)
+
+    for subparser in (signals, stream):
+        subparser.add_argument('--float32', action='store_true',
+                               help="store indicator columns in single precision, half the memory "
+                                    "(values within 1e-7 relative, same signals)")
+
+    for subparser in (signals, sweep):
+        subparser.add_argument('--roll', choices=['expiry', 'open_interest'],
+                               help="use a continuous back-adjusted series rolled on this rule "
+                                    "(default: front-month contract)")
+        subparser.add_argument('--roll-days', type=int, default=0,
+                               help="with --roll expiry, roll this many days before expiry (default: 0)")
+        subparser.add_argument('--adjust', choices=['ratio', 'difference', 'none'], default='ratio',
+                               help="back-adjustment applied at rolls (default: ratio)")
+        subparser.add_argument('-o', '--output', help="output file (default: stdout)")
+        subparser.add_argument('-f', '--format', choices=FORMATS, help="output format (default: from --output, else csv)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, 'date', None) and getattr(args, 'end', None):
+        parser.error("argument --end: not allowed with argument --date")
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+ROLL_RULES = ('expiry', 'open_interest')
+ADJUSTMENTS = ('ratio', 'difference', None)
+
+
+def _group_starts(*keys):
+    """Mask of the rows where any of the sorted ``keys`` changes value"""
+    starts = np.ones(len(keys[0]), dtype=bool)
+    if len(starts):
+        starts[1:] = False
+        for key in keys:
+            starts[1:] |= key[1:] != key[:-1]
+    return starts
+
+
+def _first_in_group(mask, group, fallback):
+    """Index of the first ``mask`` row of each group, else ``fallback[group]``"""
+    rows = np.flatnonzero(mask)
+    chosen = fallback.copy()
+    first = _group_starts(group[rows])
+    chosen[group[rows[first]]] = rows[first]
+    return chosen
+
+
+def _roll_targets(live, group, first, last, rule, days):
+    """Expiry each (Symbol, Date) group should hold under ``rule``
+
+    Rows are sorted by group and expiry; ``first`` and ``last`` index the
+    first and last row of every group.
+    """
+    date = live['Date'].to_numpy().view('i8')
+    expiry = live['Expiry'].to_numpy().view('i8')
+
+    if rule == 'expiry':
+        # Nearest contract at least ``days`` from expiry, else the farthest one
+        far_enough = expiry - date >= pd.Timedelta(days=days).value
+        return expiry[_first_in_group(far_enough, group, last)]
+
+    # Most open interest, nearer expiry on ties, else the nearest contract
+    open_int = live['Open Int'].to_numpy()
+    most = np.fmax.reduceat(open_int, first)
+    return expiry[_first_in_group(open_int == most[group], group, first)]
+
+
+def _back_adjust(held, symbol, group, expiry, close, adjust):
+    """Close of the ``held`` rows with the gap at every later roll removed
+
+    ``held`` indexes the row held for each (Symbol, Date) group; the other
+    arrays describe every listed row, sorted by symbol, date and expiry.
+    """
+    held_symbol = symbol[held]
+    held_expiry = expiry[held]
+    held_close = close[held]
+    rolls = np.flatnonzero((held_symbol[1:] == held_symbol[:-1]) & (held_expiry[1:] != held_expiry[:-1])) + 1
+
+    # Price the new contract on the last day the old one was held, with a
+    # binary search over (group, expiry rank) keys, which sort like the rows
+    expiries, rank = np.unique(expiry, return_inverse=True)
+    keys = group * len(expiries) + rank
+    wanted = (rolls - 1) * len(expiries) + np.searchsorted(expiries, held_expiry[rolls])
+    found = np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)
+    new_close = np.where(keys[found] == wanted, close[found], np.nan)
+    old_close = held_close[rolls - 1]
+
+    # Rows before a roll take its step; accumulate from the end of each symbol
+    if adjust == 'ratio':
+        step = np.ones(len(held))
+        gap = new_close / old_close
+        step[rolls] = np.where(np.isfinite(gap) & (gap > 0), gap, 1.0)
+        later = pd.Series(step[::-1]).groupby(held_symbol[::-1]).cumprod().to_numpy()[::-1] / step
+        return held_close * later
+
+    step = np.zeros(len(held))
+    gap = new_close - old_close
+    step[rolls] = np.where(np.isfinite(gap), gap, 0.0)
+    later = pd.Series(step[::-1]).groupby(held_symbol[::-1]).cumsum().to_numpy()[::-1] - step
+    return held_close + later
+
+
+def build_continuous(df, rule='expiry', days=0, adjust='ratio'):
+    """Stitch each Symbol's contracts into one back-adjusted series
+
+    ``rule`` picks the contract held on each date: 'expiry' holds the nearest
+    contract with at least ``days`` calendar days left, 'open_interest' the
+    one with the most ``Open Int``. Positions never roll back to an earlier
+    expiry. At every roll the gap between the new and old contract on the
+    last day the old one was held is removed from all earlier prices, by
+    scaling them ('ratio') or shifting them ('difference'); ``adjust=None``
+    keeps raw prices. Rolls where the new contract has no price on that day
+    are left unadjusted.
+
+    All symbols are handled by the same vectorized passes. Returns one row
+    per (Symbol, Date), sorted, holding the chosen contract's columns with
+    the adjusted Close.
+    """
+    if rule not in ROLL_RULES:
+        raise ValueError(f"Unknown roll rule {rule!r}")
+    if adjust not in ADJUSTMENTS:
+        raise ValueError(f"Unknown adjustment {adjust!r}")
+
+    live = df[df['Date'].notna() & df['Close'].notna() & (df['Expiry'] >= df['Date'])]
+    live = live.astype({'Symbol': 'category'})
+    columns = ['Date'] + [name for name in live.columns if name != 'Date']
+    if live.empty:
+        return live[columns].reset_index(drop=True)
+    symbol = live['Symbol'].cat.codes.to_numpy()
+    date = live['Date'].to_numpy().view('i8')
+    expiry = live['Expiry'].to_numpy().view('i8')
+
+    order = np.lexsort((expiry, date, symbol))
+    live = live.iloc[order]
+    symbol, date, expiry = symbol[order], date[order], expiry[order]
+    starts = _group_starts(symbol, date)
+    group = np.cumsum(starts) - 1
+    first = np.flatnonzero(starts)
+    last = np.append(first[1:], len(expiry)) - 1
+
+    # Roll target per (Symbol, Date), never back to an earlier contract
+    target = _roll_targets(live, group, first, last, rule, days)
+    target = pd.Series(target).groupby(symbol[first]).cummax().to_numpy()
+
+    # Hold the nearest contract at or after the target, else the latest listed
+    held = _first_in_group(expiry >= target[group], group, last)
+
+    front = live.iloc[held].reset_index(drop=True)
+    if adjust is not None:
+        close = live['Close'].to_numpy()
+        front['Close'] = _back_adjust(held, symbol, group, expiry, close, adjust)
+    return front[columns]
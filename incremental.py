@@ -0,0 +1,185 @@
+import io
+import os
+import threading
+
+import pandas as pd
+
+from cache import CACHE_DIR
+from indicators import INDICATOR_COLUMNS, compute_indicators
+from loader import (
+    DATA_DIR,
+    discover_files,
+    load_stock_file,
+    read_bhavcopy,
+    read_columns,
+    select_front_month,
+)
+
+
+def _read_complete(data, columns):
+    """(rows, bytes used) parsed from headerless CSV ``data``
+
+    When the last line is still being written the parse fails; the lines
+    before it are parsed instead and the partial line is not counted.
+    ``rows`` is None when no complete line was found.
+    """
+    try:
+        if data.strip():
+            return read_bhavcopy(io.BytesIO(data), columns=columns), len(data)
+        return None, len(data)
+    except ValueError:
+        end = data.rfind(b'\n') + 1
+        if end == len(data):
+            raise
+        if not data[:end].strip():
+            return None, end
+        return read_bhavcopy(io.BytesIO(data[:end]), columns=columns), end
+
+
+class IncrementalDataset:
+    """Analyzed stock data that folds in rows appended to the source CSVs
+
+    ``refresh()`` stats every file in the data directory. Files that only
+    grew are read from the previously ingested byte offset, and the new
+    dates are analyzed together with the last ``window_size - 1`` rows of
+    history, so the rolling statistics continue exactly where they stopped.
+    New, rewritten or truncated files are reloaded in full, and a stock
+    stored in several files is analyzed over all of them. A row still being
+    written is picked up by a later refresh. A single instance can be shared
+    between threads.
+    """
+
+    def __init__(self, data_dir=DATA_DIR, window_size=10, cache_dir=CACHE_DIR, dtype='float64'):
+        self.data_dir = data_dir
+        self.window_size = window_size
+        self.dtype = dtype
+        self.cache_dir = cache_dir
+        self._frames = {}  # stock -> analyzed rows sorted by Date
+        self._rows = {}  # path -> front-month rows read from that file
+        self._files = {}  # path -> (stock, columns, ingested size, mtime_ns)
+        self._data = pd.DataFrame()
+        self._version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def data(self):
+        return self._data
+
+    @property
+    def version(self):
+        """Counter bumped every time ``data`` changes"""
+        return self._version
+
+    def refresh(self):
+        """Pick up new and changed files and return the combined frame"""
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self):
+        stale = set()  # stocks to analyze again from all of their files
+        appended = False
+        seen = set()
+
+        for stock_name, path in discover_files(self.data_dir):
+            seen.add(path)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+
+            known = self._files.get(path)
+            if known is not None and known[0] == stock_name:
+                _, columns, size, mtime_ns = known
+                if stat.st_size == size and stat.st_mtime_ns == mtime_ns:
+                    continue
+                if stat.st_size > size and self._append(stock_name, path, columns, size, stat):
+                    appended = True
+                    continue
+            elif known is not None:
+                stale.add(known[0])
+
+            if self._reload(stock_name, path, stat):
+                stale.add(stock_name)
+
+        # Forget files that were removed
+        for path in set(self._files) - seen:
+            stale.add(self._files.pop(path)[0])
+            self._rows.pop(path, None)
+
+        for stock_name in stale:
+            self._analyze(stock_name)
+        if stale or appended:
+            self._combine()
+        return self._data
+
+    def _reload(self, stock_name, path, stat):
+        """Read every complete row of ``path``; False if there is none yet"""
+        columns = read_columns(path)
+        try:
+            df = load_stock_file(path, cache_dir=self.cache_dir)
+            size = stat.st_size
+        except ValueError:
+            # A row is still being written; take the lines before it
+            with open(path, 'rb') as f:
+                header = f.readline()
+                rows, consumed = _read_complete(f.read(stat.st_size - len(header)), columns)
+            if rows is None:
+                return False
+            df = select_front_month(rows)
+            size = len(header) + consumed
+
+        df['Stock'] = stock_name
+        self._rows[path] = df
+        self._files[path] = (stock_name, columns, size, stat.st_mtime_ns)
+        return True
+
+    def _analyze(self, stock_name):
+        """Indicators for ``stock_name`` over the rows of all of its files"""
+        frames = [self._rows[path] for path in sorted(self._rows) if self._files[path][0] == stock_name]
+        if not frames:
+            self._frames.pop(stock_name, None)
+            return
+        df = pd.concat(frames, ignore_index=True)
+        self._frames[stock_name] = compute_indicators(df, window_size=self.window_size, dtype=self.dtype)
+
+    def _append(self, stock_name, path, columns, offset, stat):
+        """Analyze rows written after ``offset``; False means reload instead
+
+        A last row that is still being written is left for the next refresh.
+        """
+        with open(path, 'rb') as f:
+            if offset > 0:
+                f.seek(offset - 1)
+                if f.read(1) != b'\n':
+                    return False
+            tail = f.read(stat.st_size - offset)
+
+        history = self._frames.get(stock_name)
+        if history is None:
+            return False
+
+        rows, consumed = _read_complete(tail, columns)
+        if rows is not None:
+            new_rows = select_front_month(rows)
+            new_rows['Stock'] = stock_name
+
+            # Rows for a date we already have may change its front-month contract
+            if not history.empty and (new_rows['Date'] <= history['Date'].iloc[-1]).any():
+                return False
+
+            carry = history.tail(self.window_size - 1).drop(columns=INDICATOR_COLUMNS)
+            window = pd.concat([carry, new_rows], ignore_index=True)
+            updated = compute_indicators(window, window_size=self.window_size, dtype=self.dtype).iloc[len(carry):]
+            self._frames[stock_name] = pd.concat([history, updated], ignore_index=True)
+            self._rows[path] = pd.concat([self._rows[path], new_rows], ignore_index=True)
+
+        self._files[path] = (stock_name, columns, offset + consumed, stat.st_mtime_ns)
+        return True
+
+    def _combine(self):
+        self._version += 1
+        if not self._frames:
+            self._data = pd.DataFrame()
+            return
+        frames = [self._frames[stock] for stock in sorted(self._frames)]
+        self._data = pd.concat(frames, ignore_index=True).astype({'Symbol': 'category', 'Stock': 'category'})
@@ -0,0 +1,294 @@
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+INDICATOR_COLUMNS = ['MA_10', 'STD_10', 'Upper_Band', 'Lower_Band', 'Signal', 'Std_Deviations']
+
+# Signal column codes, equal to the position each signal asks for. Labels are
+# attached with ``with_signal_labels`` only where rows are shown or exported.
+BUY, HOLD, SELL = 1, 0, -1
+SIGNAL_LABELS = {BUY: 'Buy', SELL: 'Sell', HOLD: 'Hold'}
+SIGNAL_CODES = {label: code for code, label in SIGNAL_LABELS.items()}
+
+# Largest relative difference between float32 and float64 indicator columns.
+# Values are computed in float64 and rounded once when stored, so each is
+# within half a float32 ulp (2**-24) of the float64 result, and the signals
+# are identical.
+FLOAT32_RTOL = 1e-7
+
+
+def band_signals(close, ma, std, num_std=1):
+    """Upper band, lower band and int8 signal code arrays"""
+    upper = ma + (num_std * std)
+    lower = ma - (num_std * std)
+    signal = np.full(len(close), HOLD, dtype=np.int8)
+    signal[close < lower] = BUY
+    signal[close > upper] = SELL
+    return upper, lower, signal
+
+
+def signal_labels(codes):
+    """Buy/Sell/Hold labels for signal ``codes`` as a Categorical"""
+    categories = [SIGNAL_LABELS[code] for code in (SELL, HOLD, BUY)]
+    labels = pd.Categorical.from_codes(np.asarray(codes, dtype=np.int8) - SELL, categories=categories)
+    if isinstance(codes, pd.Series):
+        return pd.Series(labels, index=codes.index, name=codes.name)
+    return labels
+
+
+def with_signal_labels(df):
+    """``df`` with its Signal codes replaced by their labels"""
+    return df.assign(Signal=signal_labels(df['Signal']))
+
+
+def indicator_frame(result_df, ma, std, num_std=1, dtype='float64'):
+    """``result_df`` with bands, signals and z-scores from rolling ``ma``/``std``
+
+    Everything is computed in float64; ``dtype='float32'`` only rounds the
+    stored indicator columns, halving their memory (see ``FLOAT32_RTOL``).
+    """
+    close = result_df['Close'].to_numpy()
+    upper, lower, signal = band_signals(close, ma, std, num_std)
+
+    # Calculate standard deviations
+    with np.errstate(divide='ignore', invalid='ignore'):
+        std_devs = (close - ma) / std
+
+    return result_df.assign(
+        MA_10=ma.astype(dtype, copy=False),
+        STD_10=std.astype(dtype, copy=False),
+        Upper_Band=upper.astype(dtype, copy=False),
+        Lower_Band=lower.astype(dtype, copy=False),
+        Signal=signal,
+        Std_Deviations=std_devs.astype(dtype, copy=False),
+    )
+
+
+def compute_indicators(df, window_size=10, num_std=1, dtype='float64'):
+    """Add MA, std dev bands, signals and z-scores for every stock in one pass
+
+    ``df`` must contain ``Stock``, ``Date`` and ``Close`` columns. Rows are
+    sorted by stock and date once, every rolling statistic is computed with a
+    single grouped operation and the result is returned as a new frame.
+    ``dtype='float32'`` stores the indicator columns in single precision.
+    """
+    result_df = df.sort_values(['Stock', 'Date']).reset_index(drop=True)
+
+    # Rolling statistics for all stocks at once
+    rolling = result_df.groupby('Stock', sort=False, observed=True)['Close'].rolling(window=window_size, min_periods=1)
+    ma = rolling.mean().to_numpy()
+    std = rolling.std().to_numpy()
+
+    return indicator_frame(result_df, ma, std, num_std, dtype)
+
+
+def compute_window_indicators(df, windows, num_std=1, dtype='float64'):
+    """``compute_indicators`` output for several window sizes at once
+
+    Returns ``{window: frame}``. All windows are served from a single
+    ``PrefixMoments`` pass over the sorted Close prices instead of one
+    rolling pass each, and the frames share the unchanged input columns.
+    The indicator columns keep their ``MA_10``/``STD_10`` names whatever
+    the window.
+    """
+    result_df = df.sort_values(['Stock', 'Date']).reset_index(drop=True)
+    moments = PrefixMoments(result_df['Close'], result_df['Stock'])
+    return {
+        window: indicator_frame(result_df, *moments.moments(window), num_std, dtype)
+        for window in windows
+    }
+
+
+class PrefixMoments:
+    """Rolling means and stds for any window from one prefix-sum pass
+
+    ``close`` must be grouped by stock (as sorted by ``compute_indicators``)
+    and ``stocks`` holds each row's stock. Prefix sums of Close and Close**2
+    are built once over all stocks; each ``moments(window)`` call is then a
+    handful of O(rows) array operations. Prices are centred on their stock's
+    mean before summing to limit cancellation in the variance. Windows whose
+    variance is still small next to the rounding error of the prefix sums
+    (nearly flat prices far into a long series) are recomputed directly from
+    their values, so every std is accurate to about ``rtol``. Flat windows
+    report their price as the exact mean and a std of 0, as pandas does,
+    so a repeated close stays inside its bands. Missing prices are skipped
+    like pandas does.
+    """
+
+    rtol = 1e-8
+
+    def __init__(self, close, stocks):
+        close = np.asarray(close, dtype='float64')
+        if isinstance(getattr(stocks, 'dtype', None), pd.CategoricalDtype):
+            stocks = stocks.cat.codes
+        stocks = np.asarray(stocks)
+        n = len(close)
+
+        starts = np.flatnonzero(np.r_[True, stocks[1:] != stocks[:-1]]) if n else np.array([], dtype=np.int64)
+        lengths = np.diff(np.r_[starts, n])
+        self.row_starts = np.repeat(starts, lengths)
+        self.positions = np.arange(n)
+
+        valid = ~np.isnan(close)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sums = np.add.reduceat(np.where(valid, close, 0.0), starts) if n else np.array([])
+            counts = np.add.reduceat(valid.astype('int64'), starts) if n else np.array([])
+            centres = np.repeat(np.where(counts > 0, sums / np.maximum(counts, 1), 0.0), lengths)
+        centred = np.where(valid, close - centres, 0.0)
+
+        self.close = close
+        self.count = np.r_[0, np.cumsum(valid)]
+        self.sum = np.r_[0.0, np.cumsum(centred)]
+        self.sum_sq = np.r_[0.0, np.cumsum(centred * centred)]
+        self.centres = centres
+
+    def moments(self, window):
+        """(mean, std) arrays matching ``rolling(window, min_periods=1)``"""
+        lo = np.maximum(self.row_starts, self.positions - window + 1)
+        hi = self.positions + 1
+
+        n = (self.count[hi] - self.count[lo]).astype('float64')
+        total = self.sum[hi] - self.sum[lo]
+        total_sq = self.sum_sq[hi] - self.sum_sq[lo]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(n > 0, total / n, np.nan)
+            m2 = total_sq - total * mean
+            std = np.where(n > 1, np.sqrt(np.maximum(m2, 0.0) / (n - 1)), np.nan)
+
+        # Rounding error of the sum of squares grows with the prefix sums
+        error = 4 * np.finfo('float64').eps * (self.sum_sq[hi] + self.sum_sq[lo])
+        inexact = np.flatnonzero((n > 1) & ((error > self.rtol * m2) | (m2 <= 0.0)))
+        mean += self.centres
+        if len(inexact):
+            mean[inexact], std[inexact] = self._direct_moments(lo[inexact], hi[inexact], window)
+        return mean, std
+
+    def _direct_moments(self, lo, hi, window):
+        """Mean and std of each window [lo, hi) from the prices themselves"""
+        index = lo[:, None] + np.arange(window)
+        inside = index < hi[:, None]
+        values = np.where(inside, self.close[np.minimum(index, len(self.close) - 1)], np.nan)
+        n = np.sum(~np.isnan(values), axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.nansum(values, axis=1) / n
+            centred = values - mean[:, None]
+            std = np.sqrt(np.nansum(centred * centred, axis=1) / (n - 1))
+
+        # A flat window's mean is its price; the sum above may be 1 ulp off
+        low = np.nanmin(values, axis=1)
+        flat = low == np.nanmax(values, axis=1)
+        mean[flat] = low[flat]
+        std[flat] = 0.0
+        return mean, std
+
+
+class RollingBands:
+    """Constant-time rolling MA/std bands for one stock's live Close feed
+
+    Each ``update(close)`` adds the new price to a ``window_size`` window and
+    returns the same fields ``compute_indicators`` produces for that row,
+    matching ``rolling(window=window_size, min_periods=1)`` to floating point
+    rounding. The running mean and sum of squared deviations are maintained
+    with Welford's add/remove updates. Like pandas, NaN closes take a place in
+    the window but are left out of the mean, the std and the count.
+    """
+
+    def __init__(self, window_size=10, num_std=1):
+        self.window_size = window_size
+        self.num_std = num_std
+        self._window = deque()
+        self._count = 0  # non-NaN values in the window
+        self._mean = 0.0
+        self._m2 = 0.0
+        # Length of the run of identical values at the end of the window
+        # (NaNs skipped), so a flat window reports an exact mean and a std of 0
+        self._same_run = 0
+        self._last = math.nan
+
+    @classmethod
+    def from_history(cls, closes, window_size=10, num_std=1):
+        """State primed with the most recent ``window_size`` closes"""
+        state = cls(window_size=window_size, num_std=num_std)
+        for close in list(closes)[-window_size:]:
+            state._add(float(close))
+        return state
+
+    def __len__(self):
+        return len(self._window)
+
+    def _add(self, value):
+        self._window.append(value)
+        if math.isnan(value):
+            return
+        if self._count and value == self._last:
+            self._same_run += 1
+        else:
+            self._same_run = 1
+        self._last = value
+        self._count += 1
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
+
+    def _remove(self):
+        value = self._window.popleft()
+        if math.isnan(value):
+            return
+        self._count -= 1
+        if self._count == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+            self._same_run = 0
+            return
+        delta = value - self._mean
+        self._mean -= delta / self._count
+        self._m2 -= delta * (value - self._mean)
+
+    def _std(self):
+        n = self._count
+        if n < 2:
+            return math.nan
+        if self._same_run >= n or self._m2 <= 0.0:
+            return 0.0
+        return math.sqrt(self._m2 / (n - 1))
+
+    def update(self, close):
+        """Add one Close and return the indicator values for it"""
+        close = float(close)
+        if len(self._window) == self.window_size:
+            self._remove()
+        self._add(close)
+
+        # A flat window has an exact mean; don't let rounding leak into it
+        if self._count == 0:
+            ma = math.nan
+        elif self._same_run >= self._count:
+            ma = self._last
+        else:
+            ma = self._mean
+        std = self._std()
+        upper = ma + (self.num_std * std)
+        lower = ma - (self.num_std * std)
+
+        if close > upper:
+            signal = SELL
+        elif close < lower:
+            signal = BUY
+        else:
+            signal = HOLD
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std_devs = float(np.float64(close - ma) / np.float64(std))
+
+        return {
+            'Close': close,
+            'MA_10': ma,
+            'STD_10': std,
+            'Upper_Band': upper,
+            'Lower_Band': lower,
+            'Signal': signal,
+            'Std_Deviations': std_devs,
+        }
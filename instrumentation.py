@@ -0,0 +1,134 @@
+import json
+import threading
+import time
+import tracemalloc
+import weakref
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+# Timers currently tracing memory, and whether they started tracemalloc
+_tracing_lock = threading.Lock()
+_tracing_timers = 0
+_started_tracing = False
+
+
+def _start_tracing():
+    global _tracing_timers, _started_tracing
+    with _tracing_lock:
+        if _tracing_timers == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        _tracing_timers += 1
+
+
+def _stop_tracing():
+    """Stop tracemalloc once the last timer using it is done, if a timer started it"""
+    global _tracing_timers, _started_tracing
+    with _tracing_lock:
+        _tracing_timers -= 1
+        if _tracing_timers == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+class StageTimer:
+    """Opt-in wall time and memory recorder for named pipeline stages
+
+    Each ``with timer.stage(name):`` block adds its duration to ``name``;
+    stages entered several times (one per file, one per chart) accumulate
+    their calls and time. With ``trace_memory`` the timer starts tracemalloc
+    and records, per stage, the net memory allocated and the largest peak
+    above the level at entry. tracemalloc sees Python and NumPy allocations
+    but not Arrow's memory pool, and stages running concurrently on worker
+    threads share a single peak counter, so their memory figures are
+    approximate. A disabled timer records nothing and costs nothing.
+
+    Tracing slows every allocation in the process, so it only runs while a
+    tracing timer is open: ``close()`` (or leaving a ``with`` block, or the
+    timer being garbage collected) stops tracemalloc once no other timer
+    needs it. Records stay readable after closing.
+    """
+
+    def __init__(self, enabled=True, trace_memory=True):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self._stages = {}
+        self._lock = threading.Lock()
+        self._finalizer = None
+        if self.trace_memory:
+            _start_tracing()
+            self._finalizer = weakref.finalize(self, _stop_tracing)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop tracing memory for this timer; later stages record time only"""
+        self.trace_memory = False
+        if self._finalizer is not None:
+            self._finalizer()
+
+    @contextmanager
+    def _measure(self, name):
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            start_memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            net = peak = 0
+            if tracing:
+                current, peak_memory = tracemalloc.get_traced_memory()
+                net = current - start_memory
+                peak = max(peak_memory - start_memory, 0)
+            self._record(name, seconds, net, peak)
+
+    def _record(self, name, seconds, net, peak):
+        with self._lock:
+            entry = self._stages.setdefault(name, {'calls': 0, 'seconds': 0.0, 'net_bytes': 0, 'peak_bytes': 0})
+            entry['calls'] += 1
+            entry['seconds'] += seconds
+            entry['net_bytes'] += net
+            entry['peak_bytes'] = max(entry['peak_bytes'], peak)
+
+    def stage(self, name):
+        """Context manager timing one run of stage ``name``"""
+        if not self.enabled:
+            return nullcontext()
+        return self._measure(name)
+
+    def records(self):
+        """One dict per stage, in the order stages were first entered"""
+        with self._lock:
+            return [
+                {
+                    'stage': name,
+                    'calls': entry['calls'],
+                    'seconds': entry['seconds'],
+                    'net_mb': entry['net_bytes'] / 2**20,
+                    'peak_mb': entry['peak_bytes'] / 2**20,
+                }
+                for name, entry in self._stages.items()
+            ]
+
+    def to_json(self, **extra):
+        """Records plus a timestamp (and any ``extra`` fields) as JSON"""
+        report = {'recorded_at': datetime.now().isoformat(timespec='seconds'), **extra, 'stages': self.records()}
+        return json.dumps(report, indent=2)
+
+    def clear(self):
+        with self._lock:
+            self._stages.clear()
+
+
+def stage(timer, name):
+    """``timer.stage(name)``, or a no-op when no timer was passed"""
+    if timer is None:
+        return nullcontext()
+    return timer.stage(name)
@@ -0,0 +1,229 @@
+import csv
+import glob
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from cache import CACHE_DIR, load_cached
+from continuous import build_continuous
+from instrumentation import stage
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pragma: no cover - falls back to the pandas C parser
+    pa = None
+    pa_csv = None
+
+DATA_DIR = os.environ.get('STOCKS_DATA_DIR', '.')
+DATE_FORMAT = '%d-%b-%Y'
+
+# Columns the strategy reads from a bhavcopy CSV and their types
+SCHEMA = {
+    'Symbol': 'category',
+    'Date': 'datetime64[ns]',
+    'Expiry': 'datetime64[ns]',
+    'Close': 'float64',
+    'Open Int': 'float64',
+}
+DATE_COLUMNS = [name for name, dtype in SCHEMA.items() if dtype.startswith('datetime')]
+NA_VALUES = ['-']
+
+# Bump whenever read_stock_file changes its output so cached frames are rebuilt
+SCHEMA_VERSION = 3
+
+_ARROW_TYPES = {
+    'category': lambda: pa.dictionary(pa.int32(), pa.string()),
+    'datetime64[ns]': lambda: pa.timestamp('ns'),
+    'float64': lambda: pa.float64(),
+}
+
+
+def read_columns(path):
+    """Stripped column names from the header row of a CSV"""
+    with open(path, newline='', encoding='utf-8') as f:
+        return [name.strip() for name in next(csv.reader(f), [])]
+
+
+def read_symbol(path):
+    """Symbol named in the first data row of a bhavcopy CSV, or None"""
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = [name.strip() for name in next(reader, [])]
+        row = next(reader, None)
+    if 'Symbol' not in header or not row:
+        return None
+    return row[header.index('Symbol')].strip() or None
+
+
+def discover_files(data_dir=DATA_DIR, pattern='*.csv'):
+    """List (symbol, path) pairs for every bhavcopy CSV in ``data_dir``
+
+    Files without a ``Symbol`` column are ignored. Results are sorted by
+    symbol so the order does not depend on the filesystem.
+    """
+    files = []
+    for path in glob.glob(os.path.join(data_dir, pattern)):
+        try:
+            symbol = read_symbol(path)
+        except (OSError, UnicodeDecodeError, csv.Error):
+            continue
+        if symbol is not None:
+            files.append((symbol, path))
+    return sorted(files)
+
+
+def data_version(data_dir=DATA_DIR, pattern='*.csv'):
+    """Short digest of the name, size and mtime of every CSV in ``data_dir``
+
+    It changes whenever a file is added, removed or modified, and only needs
+    a stat per file, so it is cheap enough to compute on every rerun.
+    """
+    digest = hashlib.sha1()
+    for path in sorted(glob.glob(os.path.join(data_dir, pattern))):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        digest.update(f'{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n'.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def select_front_month(df):
+    """Keep the nearest unexpired contract for each date
+
+    A contract is live on its expiry day. Dates where every listed contract
+    has already expired fall back to the latest of them, and rows with no
+    Expiry are only used when nothing else is listed. The choice is one
+    ``lexsort`` over (Date, contract status, Expiry) plus a first-per-date mask, so
+    whole rows are kept, in date order.
+    """
+    df = df[df['Date'].notna()]
+    date = df['Date'].to_numpy().view('i8')
+    expiry = df['Expiry'].to_numpy().view('i8')
+    missing = df['Expiry'].isna().to_numpy()
+    expired = (expiry < date) & ~missing
+
+    # Live contracts first, nearest expiry first; then expired ones, latest
+    # expiry first; then rows with no Expiry
+    status = expired.astype(np.int8)
+    status[missing] = 2
+    key = np.where(expired, -expiry, expiry)
+    order = np.lexsort((key, status, date))
+
+    sorted_dates = date[order]
+    first = np.empty(len(order), dtype=bool)
+    first[:1] = True
+    np.not_equal(sorted_dates[1:], sorted_dates[:-1], out=first[1:])
+
+    front = df.iloc[order[first]].reset_index(drop=True)
+    return front[['Date'] + [name for name in front.columns if name != 'Date']]
+
+
+def _read_csv_pandas(source, columns, header):
+    df = pd.read_csv(
+        source,
+        header=0 if header else None,
+        names=columns,
+        usecols=list(SCHEMA),
+        dtype={name: dtype for name, dtype in SCHEMA.items() if name not in DATE_COLUMNS},
+        na_values=NA_VALUES,
+    )
+    for name in DATE_COLUMNS:
+        df[name] = pd.to_datetime(df[name], format=DATE_FORMAT).astype(SCHEMA[name])
+    return df
+
+
+def _read_csv_arrow(source, columns, header):
+    read_options = pa_csv.ReadOptions(column_names=columns, skip_rows=1 if header else 0)
+    convert_options = pa_csv.ConvertOptions(
+        include_columns=list(SCHEMA),
+        column_types={name: _ARROW_TYPES[dtype]() for name, dtype in SCHEMA.items()},
+        timestamp_parsers=[DATE_FORMAT],
+        null_values=NA_VALUES + [''],
+        strings_can_be_null=True,
+    )
+    table = pa_csv.read_csv(source, read_options=read_options, convert_options=convert_options)
+    return table.to_pandas()
+
+
+def read_bhavcopy(source, columns=None, engine=None):
+    """Parse bhavcopy rows into the columns and types declared in ``SCHEMA``
+
+    ``source`` is a path, or a binary file object holding rows without a
+    header line (such as bytes appended to a file) together with their
+    ``columns``. ``engine`` is 'pyarrow' or 'c' and defaults to pyarrow when
+    it is installed.
+    """
+    header = columns is None
+    if header:
+        columns = read_columns(source)
+    if engine is None:
+        engine = 'pyarrow' if pa_csv is not None else 'c'
+
+    if engine == 'pyarrow':
+        return _read_csv_arrow(source, columns, header)
+    if engine == 'c':
+        return _read_csv_pandas(source, columns, header)
+    raise ValueError(f"Unknown CSV engine {engine!r}")
+
+
+def read_stock_file(path, engine=None, timer=None, roll=None):
+    """Read a bhavcopy CSV and keep one contract for each date
+
+    By default that is the front-month contract. ``roll`` selects a
+    back-adjusted continuous series instead; it holds keyword arguments for
+    ``continuous.build_continuous``, e.g. ``{'rule': 'expiry', 'days': 3}``.
+    """
+    with stage(timer, 'parse_csv'):
+        df = read_bhavcopy(path, engine=engine)
+    if roll is not None:
+        with stage(timer, 'continuous'):
+            return build_continuous(df, **roll)
+    with stage(timer, 'front_month'):
+        return select_front_month(df)
+
+
+def cache_version(roll=None):
+    """Cache key for frames built by ``read_stock_file`` with ``roll``"""
+    if roll is None:
+        return SCHEMA_VERSION
+    return f"{SCHEMA_VERSION}-" + ','.join(f'{name}={value}' for name, value in sorted(roll.items()))
+
+
+def load_stock_file(path, cache_dir=CACHE_DIR, timer=None, roll=None):
+    """Per-date frame for ``path``, served from the on-disk cache when fresh"""
+    parse = partial(read_stock_file, timer=timer, roll=roll)
+    return load_cached(path, parse, cache_dir=cache_dir, version=cache_version(roll), timer=timer)
+
+
+def load_stock_files(files, cache_dir=CACHE_DIR, max_workers=None, on_missing=None, timer=None, roll=None):
+    """Load (symbol, path) pairs concurrently and tag each frame with its Stock
+
+    Files are parsed on a thread pool. ``on_missing`` is called with the path
+    of any file that disappeared before it could be read; it always runs on
+    the calling thread. ``roll`` is passed on to ``read_stock_file``.
+    """
+    if not files:
+        return []
+
+    dfs = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            (stock_name, path, executor.submit(load_stock_file, path, cache_dir, timer, roll))
+            for stock_name, path in files
+        ]
+        for stock_name, path, future in futures:
+            try:
+                df = future.result()
+            except FileNotFoundError:
+                if on_missing is not None:
+                    on_missing(path)
+                continue
+            df['Stock'] = stock_name
+            dfs.append(df)
+    return dfs
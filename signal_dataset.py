@@ -0,0 +1,91 @@
+"""Signal table stored as a Hive-partitioned Parquet dataset
+
+    out_dir/Stock=DLF/Month=2025-06/part-0.parquet
+
+Each file holds one stock's rows for one calendar month, sorted by Date, and
+Parquet keeps min/max statistics per row group. ``read_signal_dataset``
+turns stock and date filters into partition filters, so a query such as
+DLF in June opens a single small file, and into Date predicates checked
+against those statistics.
+"""
+import pandas as pd
+
+from analysis import SIGNAL_COLUMNS
+from indicators import with_signal_labels
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:  # pragma: no cover - datasets need pyarrow
+    pa = None
+    ds = None
+
+PARTITION_COLUMNS = ['Stock', 'Month']
+
+# Columns stored in every file; Stock and Month live in the directory names
+VALUE_COLUMNS = [name for name in SIGNAL_COLUMNS if name != 'Stock']
+
+
+def _require_pyarrow():
+    if ds is None:
+        raise ImportError("Partitioned signal datasets need pyarrow")
+
+
+def _partitioning():
+    return ds.partitioning(pa.schema([('Stock', pa.string()), ('Month', pa.string())]), flavor='hive')
+
+
+def write_signal_dataset(data, out_dir, basename_template='part-{i}.parquet', replace=True):
+    """Write the signal columns of ``data`` partitioned by Stock and month
+
+    With ``replace`` every partition that receives rows is emptied first, so
+    rewriting a stock replaces its months; otherwise files are added next
+    to existing ones, which need a distinct ``basename_template``.
+    """
+    _require_pyarrow()
+    frame = data[SIGNAL_COLUMNS].sort_values(['Stock', 'Date'])
+    frame = with_signal_labels(frame).assign(
+        Stock=frame['Stock'].astype(str),
+        Month=frame['Date'].dt.strftime('%Y-%m'),
+    )
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    ds.write_dataset(
+        table,
+        out_dir,
+        format='parquet',
+        partitioning=_partitioning(),
+        basename_template=basename_template,
+        existing_data_behavior='delete_matching' if replace else 'overwrite_or_ignore',
+    )
+
+
+def read_signal_dataset(path, stocks=None, start=None, end=None, columns=None):
+    """Rows of a signal dataset for ``stocks`` between ``start`` and ``end``
+
+    Every argument is optional. Stocks and the months covered by the dates
+    prune whole directories before any file is opened; the dates themselves
+    are then checked against row-group statistics. ``columns`` limits the
+    value columns read. Returns rows sorted by Date and Stock.
+    """
+    _require_pyarrow()
+    dataset = ds.dataset(path, format='parquet', partitioning=_partitioning())
+
+    conditions = []
+    if stocks is not None:
+        conditions.append(ds.field('Stock').isin(list(stocks)))
+    if start is not None:
+        start = pd.Timestamp(start)
+        conditions.append(ds.field('Month') >= start.strftime('%Y-%m'))
+        conditions.append(ds.field('Date') >= pa.scalar(start.value, pa.timestamp('ns')))
+    if end is not None:
+        end = pd.Timestamp(end)
+        conditions.append(ds.field('Month') <= end.strftime('%Y-%m'))
+        conditions.append(ds.field('Date') <= pa.scalar(end.value, pa.timestamp('ns')))
+
+    condition = None
+    for term in conditions:
+        condition = term if condition is None else condition & term
+
+    columns = ['Date', 'Stock'] + [name for name in columns or VALUE_COLUMNS if name not in ('Date', 'Stock')]
+    df = dataset.to_table(columns=columns, filter=condition).to_pandas()
+    return df.sort_values(['Date', 'Stock'], kind='stable').reset_index(drop=True)
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from indicators import BUY, HOLD, SELL
+
+# Order of the (buy, sell, hold) groups returned by ``signals``
+SIGNALS = [BUY, SELL, HOLD]
+# Position in SIGNALS of every code, indexed by ``code - SELL``
+_RANKS = np.empty(len(SIGNALS), dtype=np.int8)
+_RANKS[np.array(SIGNALS) - SELL] = np.arange(len(SIGNALS))
+
+
+class DateSignalIndex:
+    """Buy/Sell/Hold rows of an analyzed frame, grouped by date
+
+    Rows are reordered once so that each date's rows are contiguous and,
+    within a date, grouped by signal. Looking up a date is then a dict access
+    plus positional slices, whatever the size of the frame. Stocks keep their
+    original relative order inside each group.
+    """
+
+    def __init__(self, data):
+        dates = data['Date'].to_numpy()
+        ranks = _RANKS[data['Signal'].to_numpy() - SELL]
+        order = np.lexsort((ranks, dates))
+        self._rows = data.take(order).reset_index(drop=True)
+
+        sorted_dates = dates[order]
+        sorted_ranks = ranks[order]
+
+        # First row of each date, and of each (date, signal) group
+        date_starts = np.flatnonzero(np.r_[True, sorted_dates[1:] != sorted_dates[:-1]])
+        date_ends = np.r_[date_starts[1:], len(order)]
+
+        self._slices = {}
+        for start, end in zip(date_starts, date_ends):
+            bounds = start + np.searchsorted(sorted_ranks[start:end], np.arange(len(SIGNALS) + 1))
+            self._slices[pd.Timestamp(sorted_dates[start])] = (start, end, bounds)
+
+        self.dates = list(self._slices)
+
+    def __contains__(self, date):
+        return pd.Timestamp(date) in self._slices
+
+    def rows(self, date):
+        """All rows for ``date``; empty if the date is unknown"""
+        entry = self._slices.get(pd.Timestamp(date))
+        if entry is None:
+            return self._rows.iloc[:0]
+        start, end, _ = entry
+        return self._rows.iloc[start:end]
+
+    def signals(self, date):
+        """(buy, sell, hold) row slices for ``date``"""
+        entry = self._slices.get(pd.Timestamp(date))
+        if entry is None:
+            empty = self._rows.iloc[:0]
+            return empty, empty, empty
+        _, _, bounds = entry
+        return tuple(self._rows.iloc[bounds[i]:bounds[i + 1]] for i in range(len(SIGNALS)))
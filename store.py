@@ -0,0 +1,208 @@
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from cache import CACHE_DIR
+from loader import DATA_DIR, SCHEMA_VERSION, discover_files, read_bhavcopy
+
+STORE_PATH = os.path.join(CACHE_DIR, 'bhavcopy.sqlite')
+
+_TABLES = """
+CREATE TABLE IF NOT EXISTS contracts (
+    Symbol TEXT NOT NULL,
+    Date INTEGER NOT NULL,
+    Expiry INTEGER NOT NULL,
+    Close REAL,
+    OpenInt REAL,
+    PRIMARY KEY (Symbol, Date, Expiry)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    symbol TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    version INTEGER NOT NULL
+);
+"""
+
+# Nearest unexpired contract per (Symbol, Date), else the latest expired one,
+# matching loader.select_front_month
+_FRONT_MONTH = """
+SELECT Date, Symbol, Expiry, Close, OpenInt FROM (
+    SELECT *, ROW_NUMBER() OVER (
+        PARTITION BY Symbol, Date
+        ORDER BY Expiry < Date, CASE WHEN Expiry < Date THEN -Expiry ELSE Expiry END
+    ) AS position
+    FROM contracts
+    WHERE {where}
+)
+WHERE position = 1
+"""
+
+# Rolling mean and sample variance per symbol over the front-month rows.
+# Prices are centred on their symbol's mean before the sums of squares to
+# limit cancellation in the variance. Flat windows (equal MIN and MAX) report
+# their price as the exact mean and a variance of 0, as pandas does, so a
+# repeated close stays inside its bands.
+_ROLLING = """
+WITH front AS ({front}),
+centred AS (
+    SELECT *, Close - AVG(Close) OVER (PARTITION BY Symbol) AS x FROM front
+),
+moments AS (
+    SELECT *,
+        AVG(Close) OVER w AS ma,
+        MIN(Close) OVER w AS low,
+        MAX(Close) OVER w AS high,
+        COUNT(x) OVER w AS n,
+        SUM(x) OVER w AS s1,
+        SUM(x * x) OVER w AS s2
+    FROM centred
+    WINDOW w AS (PARTITION BY Symbol ORDER BY Date ROWS BETWEEN {preceding} PRECEDING AND CURRENT ROW)
+)
+SELECT Date, Symbol, Expiry, Close, OpenInt,
+    CASE WHEN low = high THEN low ELSE ma END AS ma,
+    CASE WHEN n > 1 AND low = high THEN 0.0 WHEN n > 1 THEN MAX(s2 - s1 * s1 / n, 0.0) / (n - 1) END AS var
+FROM moments
+WHERE {outer}
+ORDER BY Symbol, Date
+"""
+
+
+def _day(value):
+    """Days since the epoch for a date-like ``value``"""
+    return int(pd.Timestamp(value).to_datetime64().astype('datetime64[D]').astype('int64'))
+
+
+def _to_days(column):
+    return column.to_numpy().astype('datetime64[D]').astype('int64')
+
+
+def _from_days(column):
+    return pd.to_datetime(column.to_numpy().astype('datetime64[D]')).astype('datetime64[ns]')
+
+
+class BhavcopyStore:
+    """Every contract of every bhavcopy CSV in one SQLite table
+
+    Rows are keyed and clustered on (Symbol, Date, Expiry), so filters on
+    symbols and dates read only the matching ranges. Front-month selection
+    and the rolling mean and std run inside SQLite; only the requested rows
+    reach pandas. Dates are stored as days since the epoch. ``ingest`` keeps
+    the table in step with the CSV files and only re-reads files whose size
+    or mtime changed.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_TABLES)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def ingest(self, data_dir=DATA_DIR, pattern='*.csv'):
+        """Load new and changed CSV files, drop removed ones
+
+        Returns the number of files read. Symbols are rewritten as a whole,
+        so every file of a symbol is re-read when any of them changed.
+        """
+        files = discover_files(data_dir, pattern)
+        known = {
+            path: (symbol, size, mtime_ns, version)
+            for path, symbol, size, mtime_ns, version in self.connection.execute('SELECT * FROM files')
+        }
+
+        current = {}
+        for symbol, path in files:
+            stat = os.stat(path)
+            current[os.path.abspath(path)] = (symbol, stat.st_size, stat.st_mtime_ns, SCHEMA_VERSION)
+
+        changed = {entry[0] for path, entry in current.items() if known.get(path) != entry}
+        changed |= {entry[0] for path, entry in known.items() if path not in current}
+        if not changed:
+            return 0
+
+        reread = [(path, entry) for path, entry in current.items() if entry[0] in changed]
+        with self.connection:
+            for symbol in changed:
+                self.connection.execute('DELETE FROM contracts WHERE Symbol = ?', (symbol,))
+                self.connection.execute('DELETE FROM files WHERE symbol = ?', (symbol,))
+            for path, entry in reread:
+                self._insert(entry[0], read_bhavcopy(path))
+                self.connection.execute('INSERT INTO files VALUES (?, ?, ?, ?, ?)', (path, *entry))
+        return len(reread)
+
+    def _insert(self, symbol, df):
+        df = df[df['Date'].notna() & df['Expiry'].notna()]
+        rows = zip(
+            [symbol] * len(df),
+            _to_days(df['Date']).tolist(),
+            _to_days(df['Expiry']).tolist(),
+            df['Close'].tolist(),
+            df['Open Int'].tolist(),
+        )
+        self.connection.executemany('INSERT OR REPLACE INTO contracts VALUES (?, ?, ?, ?, ?)', rows)
+
+    def symbols(self):
+        return [symbol for symbol, in self.connection.execute('SELECT DISTINCT Symbol FROM contracts ORDER BY Symbol')]
+
+    def latest_date(self):
+        """Most recent Date in the store, or None when it is empty"""
+        day, = self.connection.execute('SELECT MAX(Date) FROM contracts').fetchone()
+        return None if day is None else pd.Timestamp(day, unit='D')
+
+    def _filters(self, symbols=None, start=None, end=None):
+        clauses, params = [], []
+        if symbols is not None:
+            symbols = list(symbols)
+            clauses.append(f"Symbol IN ({', '.join('?' * len(symbols))})" if symbols else '0')
+            params.extend(symbols)
+        if start is not None:
+            clauses.append('Date >= ?')
+            params.append(_day(start))
+        if end is not None:
+            clauses.append('Date <= ?')
+            params.append(_day(end))
+        return ' AND '.join(clauses) or '1', params
+
+    def _frame(self, sql, params):
+        df = pd.read_sql_query(sql, self.connection, params=params)
+        df['Date'] = _from_days(df['Date'])
+        df['Expiry'] = _from_days(df['Expiry'])
+        return df.rename(columns={'OpenInt': 'Open Int'})
+
+    def front_month(self, symbols=None, start=None, end=None):
+        """Front-month rows for ``symbols`` (all by default) between two dates"""
+        where, params = self._filters(symbols, start, end)
+        df = self._frame(_FRONT_MONTH.format(where=where) + ' ORDER BY Symbol, Date', params)
+        return df.astype({'Symbol': 'category'})
+
+    def rolling(self, window_size=10, symbols=None, start=None, end=None):
+        """Front-month rows with the rolling mean and std of Close
+
+        Like ``compute_indicators`` the first rows of each symbol use the
+        prices available so far. Rows before ``start`` still feed the
+        windows of the first returned dates but are not returned.
+        """
+        inner, inner_params = self._filters(symbols, end=end)
+        outer, outer_params = self._filters(start=start)
+        sql = _ROLLING.format(
+            front=_FRONT_MONTH.format(where=inner),
+            preceding=int(window_size) - 1,
+            outer=outer,
+        )
+        df = self._frame(sql, inner_params + outer_params)
+        df['std'] = np.sqrt(df.pop('var').astype('float64'))
+        return df
@@ -0,0 +1,111 @@
+"""Chunked analysis for histories that do not fit in memory
+
+Each stock CSV is read ``chunk_rows`` lines at a time. The rows of the last
+date in a chunk are held back until the next chunk, since that date may
+continue there, and the last ``window_size - 1`` analyzed rows are carried
+over so the rolling statistics continue exactly where they stopped. Every
+analyzed chunk is written straight to the partitioned signal dataset of
+``signal_dataset``:
+
+    out_dir/Stock=DLF/Month=2025-06/part-00000-0.parquet
+
+so peak memory depends on the chunk size, not on the length of the history.
+"""
+import io
+import os
+import shutil
+from itertools import islice
+from urllib.parse import quote
+
+import pandas as pd
+
+from indicators import INDICATOR_COLUMNS, compute_indicators
+from instrumentation import stage
+from loader import DATA_DIR, discover_files, read_bhavcopy, read_columns, select_front_month
+from signal_dataset import write_signal_dataset
+
+CHUNK_ROWS = 100_000
+
+
+def read_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Parsed bhavcopy rows of ``path``, ``chunk_rows`` lines at a time"""
+    columns = read_columns(path)
+    with open(path, 'rb') as f:
+        f.readline()  # header
+        while True:
+            lines = list(islice(f, chunk_rows))
+            if not lines:
+                return
+            block = b''.join(lines)
+            if block.strip():
+                yield read_bhavcopy(io.BytesIO(block), columns=columns)
+
+
+def analyze_chunks(path, stock_name, window_size=10, num_std=1, chunk_rows=CHUNK_ROWS, timer=None,
+                   dtype='float64'):
+    """Yield analyzed front-month rows of one stock file, chunk by chunk
+
+    The rows match ``compute_indicators`` over the whole file. The file
+    must list its dates in ascending order, as bhavcopy exports do.
+    """
+    pending = None  # raw rows of the last date seen, which may continue
+    carry = None  # last window_size - 1 front-month rows already analyzed
+    last_date = None
+
+    def analyze(raw):
+        nonlocal carry, last_date
+        with stage(timer, 'front_month'):
+            front = select_front_month(raw)
+        if last_date is not None and (front['Date'] <= last_date).any():
+            raise ValueError(f"{path} is not sorted by Date")
+        front['Stock'] = stock_name
+
+        with stage(timer, 'indicators'):
+            window = front if carry is None else pd.concat([carry, front], ignore_index=True)
+            analyzed = compute_indicators(window, window_size=window_size, num_std=num_std, dtype=dtype)
+
+        carry = analyzed.tail(window_size - 1).drop(columns=INDICATOR_COLUMNS)
+        last_date = front['Date'].iloc[-1]
+        return analyzed.iloc[len(window) - len(front):]
+
+    for raw in read_chunks(path, chunk_rows):
+        with stage(timer, 'parse_csv'):
+            if pending is not None:
+                raw = pd.concat([pending, raw], ignore_index=True)
+            raw = raw[raw['Date'].notna()]
+        if raw.empty:
+            continue
+
+        held = raw['Date'] == raw['Date'].iloc[-1]
+        pending = raw[held]
+        if not held.all():
+            yield analyze(raw[~held])
+
+    if pending is not None and not pending.empty:
+        yield analyze(pending)
+
+
+def stream_analyze(data_dir=DATA_DIR, out_dir='signals', window_size=10, num_std=1,
+                   chunk_rows=CHUNK_ROWS, on_missing=None, timer=None, dtype='float64'):
+    """Analyze every stock CSV in ``data_dir`` into a partitioned signal dataset
+
+    Stocks are processed one at a time and each analyzed chunk is added to
+    the dataset with ``write_signal_dataset``; read it back with
+    ``signal_dataset.read_signal_dataset``. A stock's previous output is
+    replaced. Returns the number of chunks written.
+    """
+    chunks = 0
+    for stock_name, path in discover_files(data_dir):
+        # Partition directories hold URI-encoded stock names
+        shutil.rmtree(os.path.join(out_dir, f"Stock={quote(stock_name, safe='')}"), ignore_errors=True)
+        try:
+            chunks_of_stock = analyze_chunks(path, stock_name, window_size, num_std, chunk_rows, timer, dtype)
+            for part, analyzed in enumerate(chunks_of_stock):
+                with stage(timer, 'write'):
+                    write_signal_dataset(analyzed, out_dir, basename_template=f'part-{part:05d}-{{i}}.parquet',
+                                         replace=False)
+                chunks += 1
+        except FileNotFoundError:
+            if on_missing is not None:
+                on_missing(path)
+    return chunks
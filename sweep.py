@@ -0,0 +1,80 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from backtest import run_backtest, summarize_backtest
+from indicators import PrefixMoments, band_signals
+
+DEFAULT_WINDOWS = tuple(range(5, 65, 5))
+DEFAULT_MULTIPLIERS = (0.5, 1.0, 1.5, 2.0, 2.5, 3.0)
+
+# Data shared by every task in a worker process, set once by _init_worker
+_worker_state = {}
+
+
+def _init_worker(data, moments, allow_short, cost_bps):
+    _worker_state.update(
+        data=data,
+        moments=moments,
+        allow_short=allow_short,
+        cost_bps=cost_bps,
+    )
+
+
+def _evaluate_window(window, multipliers):
+    """Backtest metrics for one window and every band multiplier"""
+    data = _worker_state['data']
+    mean, std = _worker_state['moments'].moments(window)
+    close = data['Close'].to_numpy()
+
+    rows = []
+    for num_std in multipliers:
+        _, _, signal = band_signals(close, mean, std, num_std)
+        results = run_backtest(
+            data.assign(Signal=signal),
+            allow_short=_worker_state['allow_short'],
+            cost_bps=_worker_state['cost_bps'],
+        )
+        summary = summarize_backtest(results)
+        rows.append({
+            'Window': window,
+            'Num_Std': num_std,
+            'Mean_Return': summary['Total_Return'].mean(),
+            'Median_Return': summary['Total_Return'].median(),
+            'Mean_Hit_Rate': summary['Hit_Rate'].mean(),
+            'Worst_Drawdown': summary['Max_Drawdown'].min(),
+            'Mean_Drawdown': summary['Max_Drawdown'].mean(),
+            'Mean_Turnover': summary['Turnover'].mean(),
+        })
+    return rows
+
+
+def sweep(data, windows=DEFAULT_WINDOWS, multipliers=DEFAULT_MULTIPLIERS, allow_short=True,
+          cost_bps=0.0, rank_by='Mean_Return', max_workers=None):
+    """Backtest every (window, band multiplier) pair across all stocks
+
+    Prefix sums of Close are computed once and shared by all windows. Each
+    window is one task on a process pool, evaluating all multipliers for it;
+    ``max_workers=1`` runs everything in this process instead. Returns one
+    row per pair with metrics averaged over stocks, best ``rank_by`` first.
+    """
+    data = data[['Stock', 'Date', 'Close']].sort_values(['Stock', 'Date']).reset_index(drop=True)
+    moments = PrefixMoments(data['Close'], data['Stock'])
+    multipliers = tuple(multipliers)
+    init_args = (data, moments, allow_short, cost_bps)
+
+    rows = []
+    if max_workers == 1:
+        _init_worker(*init_args)
+        for window in windows:
+            rows.extend(_evaluate_window(window, multipliers))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=init_args) as executor:
+            futures = [executor.submit(_evaluate_window, window, multipliers) for window in windows]
+            for future in futures:
+                rows.extend(future.result())
+
+    results = pd.DataFrame(rows)
+    if results.empty:
+        return results
+    return results.sort_values(rank_by, ascending=False, kind='stable').reset_index(drop=True)